@@ -11,21 +11,67 @@ Description: A comprehensive toolkit for hiding and extracting data within vario
 """
 
 import os
+import io
 import sys
+import json
+import time
 import argparse
+import contextlib
 import random
+import shutil
 import string
 import hashlib
 import base64
 import binascii
 import struct
 import wave
+import zlib
 import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from PIL import Image
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.backends import default_backend
 
+# Container header: magic, version, flags, method, payload length, CRC-32 of the payload
+CONTAINER_HEADER = struct.Struct('>4sBBBII')
+CONTAINER_MAGIC = b'STG\x00'
+CONTAINER_VERSION = 1
+
+# Container flags
+FLAG_ENCRYPTED = 0x01
+FLAG_TEXT = 0x02
+
+# Audio sample widths in bytes that LSB embedding supports (8, 16, 24 and 32-bit PCM)
+SAMPLE_WIDTHS = (1, 2, 3, 4)
+
+# Payload bytes processed per block when streaming audio samples
+STREAM_BLOCK_SIZE = 1 << 20
+
+# PNG file signature
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Bytes read or written per step when streaming image strips
+STRIP_IO_SIZE = 1 << 20
+
+# Carrier extensions picked up when a batch input is a directory
+AUDIO_EXTENSIONS = ('.wav',)
+
+# Image formats that keep every pixel value, so data hidden in the pixels survives saving
+LOSSLESS_IMAGE_FORMATS = ('PNG', 'BMP', 'TIFF', 'PPM')
+
+# Jobs kept queued per batch worker, so a large batch is not submitted to the pool all at once
+BATCH_QUEUE_SIZE = 4
+
+# Method identifiers stored in the container header
+METHOD_CODES = {
+    'lsb': 1,
+    'dct': 2,
+    'metadata': 3,
+    'echo': 4
+}
+
 # ASCII Art Banner
 BANNER = """
  ____  _                   _____           _ _    _ _   
@@ -37,9 +83,412 @@ BANNER = """
                                         By: Abdul Haseeb (@h4x33b)
 """
 
+class PayloadContainer:
+    """Binary-safe container shared by every hide/extract method: a fixed header, then the raw payload"""
+    
+    @staticmethod
+    def pack(data, method, password=None):
+        """
+        Wrap data in a container
+        
+        Args:
+            data (str or bytes): Data to hide; text is stored as UTF-8
+            method (str): Name of the method that will embed the container
+            password (str, optional): Password for encryption
+            
+        Returns:
+            bytes: Header followed by the (possibly encrypted) payload
+        """
+        flags = 0
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+            flags |= FLAG_TEXT
+        if password:
+            data = Encryption.encrypt_bytes(data, password)
+            flags |= FLAG_ENCRYPTED
+        
+        header = CONTAINER_HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, flags, METHOD_CODES[method],
+                                       len(data), zlib.crc32(data))
+        return header + data
+    
+    @staticmethod
+    def parse_header(header):
+        """
+        Decode a container header
+        
+        Args:
+            header (bytes): At least CONTAINER_HEADER.size bytes read from a carrier
+            
+        Returns:
+            dict: Header fields, or None if the bytes are not a container header
+        """
+        if len(header) < CONTAINER_HEADER.size:
+            return None
+        magic, version, flags, method, length, checksum = CONTAINER_HEADER.unpack(header[:CONTAINER_HEADER.size])
+        if magic != CONTAINER_MAGIC or version != CONTAINER_VERSION:
+            return None
+        return {'flags': flags, 'method': method, 'length': length, 'checksum': checksum}
+    
+    @staticmethod
+    def unpack(header, payload, method, password=None):
+        """
+        Verify a container's payload and undo its encryption and encoding
+        
+        Args:
+            header (dict): Fields returned by parse_header
+            payload (bytes): Payload bytes that followed the header
+            method (str): Method the caller expects the data to have been hidden with
+            password (str, optional): Password for decryption
+            
+        Returns:
+            str or bytes: Text if text was hidden, bytes otherwise
+        """
+        if header['method'] != METHOD_CODES[method]:
+            hidden_with = next((name for name, code in METHOD_CODES.items() if code == header['method']), 'unknown')
+            raise ValueError(f"Data was hidden with the {hidden_with} method, not {method}")
+        if len(payload) != header['length'] or zlib.crc32(payload) != header['checksum']:
+            raise ValueError("Checksum mismatch, hidden data is corrupted or truncated")
+        
+        if header['flags'] & FLAG_ENCRYPTED:
+            if not password:
+                raise ValueError("Hidden data is encrypted, a password is required")
+            payload = Encryption.decrypt_bytes(payload, password)
+        
+        if header['flags'] & FLAG_TEXT:
+            return payload.decode('utf-8')
+        return payload
+
+class StripImage:
+    """Class for reading and rewriting the top rows of an image without decoding the whole carrier"""
+    
+    @staticmethod
+    def open(image_path, output_path=None):
+        """
+        Open an image, lifting Pillow's decompression bomb limit only if it can be processed in strips
+        
+        Args:
+            image_path (str): Path to the image
+            output_path (str, optional): Output path, which must keep the carrier's format
+            
+        Returns:
+            tuple: (image, layout returned by layout)
+        """
+        # The limit is checked as the header is read, before the layout is known, so it is lifted for the open
+        # and applied again afterwards to images that have to be decoded whole
+        limit = Image.MAX_IMAGE_PIXELS
+        Image.MAX_IMAGE_PIXELS = None
+        try:
+            img = Image.open(image_path)
+        finally:
+            Image.MAX_IMAGE_PIXELS = limit
+        
+        strips = StripImage.layout(image_path, img, output_path)
+        if strips is None:
+            Image._decompression_bomb_check(img.size)
+        return img, strips
+    
+    @staticmethod
+    def png_chunks(f):
+        """
+        List the chunks of a PNG file without reading their data
+        
+        Args:
+            f (file): PNG file opened in binary mode
+            
+        Returns:
+            list: (chunk type, data offset, data length) for each chunk
+        """
+        chunks = []
+        position = len(PNG_SIGNATURE)
+        while True:
+            f.seek(position)
+            head = f.read(8)
+            if len(head) < 8:
+                return chunks
+            length, chunk_type = struct.unpack('>I4s', head)
+            chunks.append((chunk_type, position + 8, length))
+            # Skip the data and the CRC
+            position += 12 + length
+    
+    @staticmethod
+    def idat_pieces(f, chunks):
+        """
+        Yield the compressed image data of a PNG file in bounded pieces
+        
+        Args:
+            f (file): PNG file opened in binary mode
+            chunks (list): Chunks returned by png_chunks
+        """
+        for chunk_type, offset, length in chunks:
+            if chunk_type != b'IDAT':
+                continue
+            for start in range(0, length, STRIP_IO_SIZE):
+                f.seek(offset + start)
+                yield f.read(min(STRIP_IO_SIZE, length - start))
+    
+    @staticmethod
+    def layout(image_path, img, output_path=None):
+        """
+        Work out whether an image can be processed in strips
+        
+        Args:
+            image_path (str): Path to the image
+            img (Image): The image opened with Pillow, not yet loaded
+            output_path (str, optional): Output path, which must keep the carrier's format
+            
+        Returns:
+            list: [] for an 8-bit RGB non-interlaced PNG, (first row, end row, offset) strips for
+                  uncompressed RGB data, or None if the image has to be decoded whole
+        """
+        if img.mode != 'RGB' or getattr(img, 'n_frames', 1) != 1:
+            return None
+        if output_path and Image.registered_extensions().get(os.path.splitext(output_path)[1].lower()) != img.format:
+            return None
+        
+        if img.format == 'PNG':
+            # 16-bit PNGs decode through another raw mode; byte 28 of the file is the IHDR interlace method
+            with open(image_path, 'rb') as f:
+                interlaced = f.read(29)[28]
+            if len(img.tile) == 1 and img.tile[0][3] == 'RGB' and not interlaced:
+                return []
+            return None
+        
+        # Uncompressed data (TIFF, PPM) can be memory-mapped strip by strip
+        strips = []
+        for codec, extents, offset, args in img.tile:
+            if codec != 'raw':
+                return None
+            rawmode, stride, orientation = (args, 0, 1) if isinstance(args, str) else args
+            if (rawmode != 'RGB' or stride not in (0, img.width * 3) or orientation != 1
+                    or extents[0] != 0 or extents[2] != img.width):
+                return None
+            strips.append((extents[1], extents[3], offset))
+        
+        strips.sort()
+        if not strips or strips[0][0] != 0 or any(a[1] != b[0] for a, b in zip(strips, strips[1:])):
+            return None
+        return strips
+    
+    @staticmethod
+    def png_prefix(pieces, count, stride):
+        """
+        Read compressed PNG data until it holds count rows
+        
+        Args:
+            pieces (iterator): Compressed pieces from idat_pieces
+            count (int): Number of rows needed
+            stride (int): Length of a filtered row, including its filter byte
+            
+        Returns:
+            tuple: (compressed prefix, decompressed prefix, decompressor to carry on with)
+        """
+        decompressor = zlib.decompressobj()
+        compressed, decompressed, total = [], [], 0
+        for piece in pieces:
+            compressed.append(piece)
+            decompressed.append(decompressor.decompress(piece))
+            total += len(decompressed[-1])
+            if total >= count * stride:
+                break
+        return b''.join(compressed), b''.join(decompressed), decompressor
+    
+    @staticmethod
+    def read_rows(image_path, strips, count):
+        """
+        Decode the top rows of an image
+        
+        Args:
+            image_path (str): Path to the image
+            strips (list): Layout returned by layout
+            count (int): Number of rows to read
+            
+        Returns:
+            numpy.ndarray: Writable (count, width, 3) array of channel values
+        """
+        img = StripImage.open(image_path)[0]
+        width, count = img.width, min(count, img.height)
+        
+        if strips:
+            rows = np.empty((count, width, 3), dtype=np.uint8)
+            for first, end, offset in strips:
+                if first >= count:
+                    break
+                end = min(end, count)
+                rows[first:end] = np.memmap(image_path, dtype=np.uint8, mode='r', offset=offset,
+                                            shape=(end - first, width, 3))
+            return rows
+        
+        # Pillow's PNG decoder stops once the requested rows are filled, so only the compressed prefix is needed
+        with open(image_path, 'rb') as f:
+            pieces = StripImage.idat_pieces(f, StripImage.png_chunks(f))
+            prefix = StripImage.png_prefix(pieces, count, width * 3 + 1)[0]
+        return np.array(Image.frombytes('RGB', (width, count), prefix, 'zip', 'RGB'))
+    
+    @staticmethod
+    def write_rows(image_path, strips, rows, output_path):
+        """
+        Write a copy of an image with its top rows replaced, leaving everything else as it was
+        
+        Args:
+            image_path (str): Path to the carrier image
+            strips (list): Layout returned by layout
+            rows (numpy.ndarray): New (count, width, 3) top rows
+            output_path (str): Path to save the output image
+        """
+        count, width = rows.shape[:2]
+        
+        if strips:
+            # Copy the carrier unchanged, then overwrite the mapped rows in place
+            shutil.copyfile(image_path, output_path)
+            for first, end, offset in strips:
+                if first >= count:
+                    break
+                end = min(end, count)
+                region = np.memmap(output_path, dtype=np.uint8, mode='r+', offset=offset, shape=(end - first, width, 3))
+                region[:] = rows[first:end]
+                region.flush()
+                del region
+            return
+        
+        stride = width * 3 + 1
+        with open(image_path, 'rb') as src, open(output_path, 'wb') as dst:
+            chunks = StripImage.png_chunks(src)
+            
+            # IHDR is always the first chunk, starting with the width and height
+            src.seek(chunks[0][1])
+            height = struct.unpack('>II', src.read(8))[1]
+            
+            # The row after the replaced ones is filtered against the original row above it, so it is
+            # decoded and rewritten unfiltered too; every later row is passed through as it was
+            pieces = StripImage.idat_pieces(src, chunks)
+            redone = min(count + 1, height)
+            prefix, decompressed, decompressor = StripImage.png_prefix(pieces, redone, stride)
+            original = np.asarray(Image.frombytes('RGB', (width, redone), prefix, 'zip', 'RGB'))
+            
+            compressor = zlib.compressobj()
+            pending = []
+            
+            def write_idat(data, final=False):
+                # Gather compressed output into chunks of about STRIP_IO_SIZE bytes
+                pending.append(data)
+                if sum(map(len, pending)) >= STRIP_IO_SIZE or final:
+                    body = b''.join(pending)
+                    pending.clear()
+                    dst.write(struct.pack('>I', len(body)) + b'IDAT' + body)
+                    dst.write(struct.pack('>I', zlib.crc32(body, zlib.crc32(b'IDAT'))))
+            
+            dst.write(PNG_SIGNATURE)
+            written = False
+            for chunk_type, offset, length in chunks:
+                if chunk_type != b'IDAT':
+                    # Copy every other chunk with its header and CRC
+                    src.seek(offset - 8)
+                    dst.write(src.read(length + 12))
+                    continue
+                if written:
+                    continue
+                
+                # Replace the first IDAT chunk with the whole re-encoded image data, and drop the rest
+                for row in range(redone):
+                    values = rows[row] if row < count else original[row]
+                    write_idat(compressor.compress(b'\x00' + values.tobytes()))
+                write_idat(compressor.compress(decompressed[redone * stride:]))
+                for piece in pieces:
+                    write_idat(compressor.compress(decompressor.decompress(piece)))
+                write_idat(compressor.compress(decompressor.flush()) + compressor.flush(), final=True)
+                written = True
+
 class ImageSteganography:
     """Class for handling image steganography operations"""
     
+    @staticmethod
+    def embed_lsb(image_path, blob, output_path):
+        """
+        Write bytes into the least significant bits of an image's channel values
+        
+        Args:
+            image_path (str): Path to the carrier image
+            blob (bytes): Bytes to embed
+            output_path (str): Path to save the output image
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        # Open the image; where the format allows it, only the rows that carry the payload are decoded and rewritten
+        img, strips = StripImage.open(image_path, output_path)
+        width, height = img.size
+        
+        # Bits of the blob, most significant bit first
+        bits = np.unpackbits(np.frombuffer(blob, dtype=np.uint8))
+        
+        # Check if the image has enough pixels to store the data
+        if len(bits) > width * height * 3:
+            print("[!] Error: Data too large for the image")
+            return False
+        
+        if strips is not None:
+            rows = StripImage.read_rows(image_path, strips, -(-len(bits) // (width * 3)))
+            flat = rows.reshape(-1)
+            flat[:len(bits)] = (flat[:len(bits)] & 0xFE) | bits
+            StripImage.write_rows(image_path, strips, rows, output_path)
+            return True
+        
+        # Convert to RGB if necessary
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        
+        # Channel values in pixel order (row by row, R then G then B); replace the low bit of the first len(bits)
+        channels = np.array(img, dtype=np.uint8)
+        flat = channels.reshape(-1)
+        flat[:len(bits)] = (flat[:len(bits)] & 0xFE) | bits
+        
+        stego_img = Image.fromarray(channels, 'RGB')
+        stego_img.info = img.info.copy()
+        
+        # Save the output image
+        stego_img.save(output_path)
+        return True
+    
+    @staticmethod
+    def read_lsb(image_path):
+        """
+        Read a container from the least significant bits of an image
+        
+        Args:
+            image_path (str): Path to the stego image
+            
+        Returns:
+            tuple: (header, payload bytes), or (None, data) for images written before the container format
+        """
+        # Open the image
+        img, strips = StripImage.open(image_path)
+        width, height = img.size
+        
+        # Convert to RGB if necessary
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        
+        capacity = width * height * 3 // 8
+        
+        def read_bytes(count):
+            # Only the rows holding the first count bytes are copied out of the image
+            rows = min(-(-count * 8 // (width * 3)), height)
+            if strips is not None:
+                region = StripImage.read_rows(image_path, strips, rows)
+            else:
+                region = np.asarray(img.crop((0, 0, width, rows)), dtype=np.uint8)
+            return np.packbits(region.reshape(-1)[:count * 8] & 1).tobytes()
+        
+        # Read the header first, then exactly as many bytes as it declares
+        header = PayloadContainer.parse_header(read_bytes(min(CONTAINER_HEADER.size, capacity)))
+        if header is None:
+            # Older images end their data with a NUL byte
+            return None, read_bytes(capacity).split(b'\x00', 1)[0]
+        
+        if CONTAINER_HEADER.size + header['length'] > capacity:
+            raise ValueError("Hidden data length exceeds the image capacity")
+        return header, read_bytes(CONTAINER_HEADER.size + header['length'])[CONTAINER_HEADER.size:]
+    
     @staticmethod
     def hide_lsb(image_path, data, output_path, password=None):
         """
@@ -47,7 +496,7 @@ class ImageSteganography:
         
         Args:
             image_path (str): Path to the carrier image
-            data (str): Data to hide
+            data (str or bytes): Data to hide
             output_path (str): Path to save the output image
             password (str, optional): Password for encryption
             
@@ -55,62 +504,7 @@ class ImageSteganography:
             bool: True if successful, False otherwise
         """
         try:
-            # Open the image
-            img = Image.open(image_path)
-            width, height = img.size
-            
-            # Convert to RGB if necessary
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Encrypt data if password is provided
-            if password:
-                data = Encryption.encrypt_aes(data, password)
-            
-            # Convert data to binary
-            binary_data = ''.join(format(ord(char), '08b') for char in data)
-            binary_data += '00000000'  # Add terminator
-            
-            # Check if the image has enough pixels to store the data
-            if len(binary_data) > width * height * 3:
-                print("[!] Error: Data too large for the image")
-                return False
-            
-            # Create a copy of the image
-            stego_img = img.copy()
-            pixels = stego_img.load()
-            
-            # Embed data in the image
-            idx = 0
-            for y in range(height):
-                for x in range(width):
-                    r, g, b = pixels[x, y]
-                    
-                    # Modify the least significant bit of each color channel
-                    if idx < len(binary_data):
-                        r = (r & 0xFE) | int(binary_data[idx])
-                        idx += 1
-                    
-                    if idx < len(binary_data):
-                        g = (g & 0xFE) | int(binary_data[idx])
-                        idx += 1
-                    
-                    if idx < len(binary_data):
-                        b = (b & 0xFE) | int(binary_data[idx])
-                        idx += 1
-                    
-                    pixels[x, y] = (r, g, b)
-                    
-                    # Check if all data has been embedded
-                    if idx >= len(binary_data):
-                        break
-                
-                if idx >= len(binary_data):
-                    break
-            
-            # Save the output image
-            stego_img.save(output_path)
-            return True
+            return ImageSteganography.embed_lsb(image_path, PayloadContainer.pack(data, 'lsb', password), output_path)
         
         except Exception as e:
             print(f"[!] Error: {e}")
@@ -126,40 +520,15 @@ class ImageSteganography:
             password (str, optional): Password for decryption
             
         Returns:
-            str: Extracted data
+            str or bytes: Extracted data
         """
         try:
-            # Open the image
-            img = Image.open(image_path)
-            width, height = img.size
-            
-            # Convert to RGB if necessary
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            pixels = img.load()
-            
-            # Extract binary data from the image
-            binary_data = ""
-            for y in range(height):
-                for x in range(width):
-                    r, g, b = pixels[x, y]
-                    
-                    # Extract the least significant bit of each color channel
-                    binary_data += str(r & 1)
-                    binary_data += str(g & 1)
-                    binary_data += str(b & 1)
-            
-            # Convert binary data to ASCII
-            extracted_data = ""
-            for i in range(0, len(binary_data), 8):
-                byte = binary_data[i:i+8]
-                if byte == "00000000":  # Terminator
-                    break
-                
-                extracted_data += chr(int(byte, 2))
+            header, payload = ImageSteganography.read_lsb(image_path)
+            if header:
+                return PayloadContainer.unpack(header, payload, 'lsb', password)
             
-            # Decrypt data if password is provided
+            # Older images hold Latin-1 text, base64 when encrypted
+            extracted_data = payload.decode('latin-1')
             if password:
                 extracted_data = Encryption.decrypt_aes(extracted_data, password)
             
@@ -176,7 +545,7 @@ class ImageSteganography:
         
         Args:
             image_path (str): Path to the carrier image
-            data (str): Data to hide
+            data (str or bytes): Data to hide
             output_path (str): Path to save the output image
             password (str, optional): Password for encryption
             
@@ -186,17 +555,8 @@ class ImageSteganography:
         try:
             # This is a simplified implementation
             # In a real-world scenario, you would use DCT coefficients
-            # For now, we'll use a modified LSB approach
-            
-            # Encrypt data if password is provided
-            if password:
-                data = Encryption.encrypt_aes(data, password)
-            
-            # Add a marker to indicate DCT method
-            data = "DCT:" + data
-            
-            # Use LSB method for now
-            return ImageSteganography.hide_lsb(image_path, data, output_path)
+            # For now, we'll use a modified LSB approach, with the method recorded in the container
+            return ImageSteganography.embed_lsb(image_path, PayloadContainer.pack(data, 'dct', password), output_path)
         
         except Exception as e:
             print(f"[!] Error: {e}")
@@ -212,14 +572,17 @@ class ImageSteganography:
             password (str, optional): Password for decryption
             
         Returns:
-            str: Extracted data
+            str or bytes: Extracted data
         """
         try:
             # Extract using LSB method for now
-            data = ImageSteganography.extract_lsb(image_path)
+            header, payload = ImageSteganography.read_lsb(image_path)
+            if header:
+                return PayloadContainer.unpack(header, payload, 'dct', password)
             
-            # Check for DCT marker
-            if data and data.startswith("DCT:"):
+            # Older images mark DCT data with a text prefix
+            data = payload.decode('latin-1')
+            if data.startswith("DCT:"):
                 data = data[4:]  # Remove marker
                 
                 # Decrypt data if password is provided
@@ -241,7 +604,7 @@ class ImageSteganography:
         
         Args:
             image_path (str): Path to the carrier image
-            data (str): Data to hide
+            data (str or bytes): Data to hide
             output_path (str): Path to save the output image
             password (str, optional): Password for encryption
             
@@ -252,16 +615,12 @@ class ImageSteganography:
             # Open the image
             img = Image.open(image_path)
             
-            # Encrypt data if password is provided
-            if password:
-                data = Encryption.encrypt_aes(data, password)
-            
-            # Add a marker to indicate metadata method
-            data = "META:" + data
+            # Comments are text, so the container is stored base64-encoded
+            blob = PayloadContainer.pack(data, 'metadata', password)
             
             # Add data to EXIF metadata
             exif_data = img.info.get('exif', b'')
-            comment = f"SteganoComment: {data}".encode('utf-8')
+            comment = b"SteganoComment: " + base64.b64encode(blob)
             
             # Save the image with the modified metadata
             img.save(output_path, exif=exif_data, comment=comment)
@@ -281,7 +640,7 @@ class ImageSteganography:
             password (str, optional): Password for decryption
             
         Returns:
-            str: Extracted data
+            str or bytes: Extracted data
         """
         try:
             # Open the image
@@ -292,9 +651,13 @@ class ImageSteganography:
             if isinstance(comment, bytes):
                 comment = comment.decode('utf-8', errors='ignore')
             
-            # Check for metadata marker
-            if comment and "SteganoComment: META:" in comment:
-                data = comment.split("SteganoComment: META:")[1]
+            if not comment or "SteganoComment: " not in comment:
+                return None
+            data = comment.split("SteganoComment: ", 1)[1]
+            
+            # Older images store the text itself after a metadata marker
+            if data.startswith("META:"):
+                data = data[5:]
                 
                 # Decrypt data if password is provided
                 if password:
@@ -302,7 +665,11 @@ class ImageSteganography:
                 
                 return data
             
-            return None
+            blob = base64.b64decode(data)
+            header = PayloadContainer.parse_header(blob)
+            if header is None:
+                return None
+            return PayloadContainer.unpack(header, blob[CONTAINER_HEADER.size:], 'metadata', password)
         
         except Exception as e:
             print(f"[!] Error: {e}")
@@ -311,6 +678,122 @@ class ImageSteganography:
 class AudioSteganography:
     """Class for handling audio steganography operations"""
     
+    @staticmethod
+    def data_chunk(audio_path):
+        """
+        Locate the sample data of a WAV file
+        
+        Args:
+            audio_path (str): Path to the audio file
+            
+        Returns:
+            tuple: (byte offset of the sample data, wave parameters)
+        """
+        # Let the wave module validate the format and report the parameters
+        with wave.open(audio_path, 'rb') as audio:
+            params = audio.getparams()
+        
+        if params.sampwidth not in SAMPLE_WIDTHS:
+            raise ValueError(f"Unsupported sample width of {params.sampwidth * 8} bits")
+        
+        # Walk the RIFF chunks to find where the data chunk starts
+        with open(audio_path, 'rb') as f:
+            f.seek(12)
+            while True:
+                chunk = f.read(8)
+                if len(chunk) < 8:
+                    raise ValueError("WAV file has no data chunk")
+                chunk_id, chunk_size = struct.unpack('<4sI', chunk)
+                if chunk_id == b'data':
+                    return f.tell(), params
+                # Chunks are padded to an even size
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+    
+    @staticmethod
+    def embed_lsb(audio_path, blob, output_path):
+        """
+        Write bytes into the least significant bits of an audio file's samples
+        
+        Args:
+            audio_path (str): Path to the carrier audio file
+            blob (bytes): Bytes to embed
+            output_path (str): Path to save the output audio file
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        offset, params = AudioSteganography.data_chunk(audio_path)
+        sampwidth = params.sampwidth
+        
+        # Check if the audio has enough samples to store the data
+        if len(blob) * 8 > params.nframes * params.nchannels:
+            print("[!] Error: Data too large for the audio file")
+            return False
+        
+        # Copy the carrier unchanged; copyfile uses sendfile or copy_file_range where the OS has them
+        shutil.copyfile(audio_path, output_path)
+        if not blob:
+            return True
+        
+        # Map only the samples that will carry the payload and rewrite them a block at a time
+        samples = np.memmap(output_path, dtype=np.uint8, mode='r+', offset=offset,
+                            shape=(len(blob) * 8 * sampwidth,))
+        
+        # WAV samples are little-endian, so every sampwidth-th byte holds a sample's least significant bit
+        lsb_bytes = samples[::sampwidth]
+        for start in range(0, len(blob), STREAM_BLOCK_SIZE):
+            bits = np.unpackbits(np.frombuffer(blob[start:start + STREAM_BLOCK_SIZE], dtype=np.uint8))
+            block = lsb_bytes[start * 8:start * 8 + len(bits)]
+            block[:] = (block & 0xFE) | bits
+        
+        samples.flush()
+        del samples
+        return True
+    
+    @staticmethod
+    def read_lsb(audio_path):
+        """
+        Read a container from the least significant bits of an audio file
+        
+        Args:
+            audio_path (str): Path to the stego audio file
+            
+        Returns:
+            tuple: (header, payload bytes), or (None, data) for files written before the container format
+        """
+        offset, params = AudioSteganography.data_chunk(audio_path)
+        sampwidth = params.sampwidth
+        capacity = params.nframes * params.nchannels // 8
+        if capacity == 0:
+            return None, b''
+        
+        # Map the sample data read-only; pages are only read as the bytes below are touched
+        samples = np.memmap(audio_path, dtype=np.uint8, mode='r', offset=offset,
+                            shape=(capacity * 8 * sampwidth,))
+        lsb_bytes = samples[::sampwidth]
+        
+        def read_bytes(start, count):
+            return np.packbits(lsb_bytes[start * 8:(start + count) * 8] & 1).tobytes()
+        
+        # Read the header first, then exactly as many bytes as it declares
+        header = PayloadContainer.parse_header(read_bytes(0, min(CONTAINER_HEADER.size, capacity)))
+        if header is None:
+            # Older files end their data with a NUL byte; scan block by block until it turns up
+            blocks = []
+            for start in range(0, capacity, STREAM_BLOCK_SIZE):
+                blocks.append(read_bytes(start, min(STREAM_BLOCK_SIZE, capacity - start)))
+                if b'\x00' in blocks[-1]:
+                    break
+            return None, b''.join(blocks).split(b'\x00', 1)[0]
+        
+        if CONTAINER_HEADER.size + header['length'] > capacity:
+            raise ValueError("Hidden data length exceeds the audio capacity")
+        
+        payload = b''.join(read_bytes(start, min(STREAM_BLOCK_SIZE, CONTAINER_HEADER.size + header['length'] - start))
+                           for start in range(CONTAINER_HEADER.size, CONTAINER_HEADER.size + header['length'],
+                                              STREAM_BLOCK_SIZE))
+        return header, payload
+    
     @staticmethod
     def hide_lsb(audio_path, data, output_path, password=None):
         """
@@ -318,7 +801,7 @@ class AudioSteganography:
         
         Args:
             audio_path (str): Path to the carrier audio file
-            data (str): Data to hide
+            data (str or bytes): Data to hide
             output_path (str): Path to save the output audio file
             password (str, optional): Password for encryption
             
@@ -326,49 +809,7 @@ class AudioSteganography:
             bool: True if successful, False otherwise
         """
         try:
-            # Open the audio file
-            audio = wave.open(audio_path, 'rb')
-            
-            # Get audio parameters
-            params = audio.getparams()
-            nchannels, sampwidth, framerate, nframes = params[:4]
-            
-            # Read frames
-            frames = audio.readframes(nframes)
-            audio.close()
-            
-            # Convert frames to samples
-            samples = np.frombuffer(frames, dtype=np.int16)
-            
-            # Encrypt data if password is provided
-            if password:
-                data = Encryption.encrypt_aes(data, password)
-            
-            # Convert data to binary
-            binary_data = ''.join(format(ord(char), '08b') for char in data)
-            binary_data += '00000000'  # Add terminator
-            
-            # Check if the audio has enough samples to store the data
-            if len(binary_data) > len(samples):
-                print("[!] Error: Data too large for the audio file")
-                return False
-            
-            # Embed data in the audio
-            for i in range(len(binary_data)):
-                if i < len(samples):
-                    # Modify the least significant bit
-                    samples[i] = (samples[i] & 0xFFFE) | int(binary_data[i])
-            
-            # Convert samples back to frames
-            modified_frames = samples.tobytes()
-            
-            # Create output audio file
-            output_audio = wave.open(output_path, 'wb')
-            output_audio.setparams(params)
-            output_audio.writeframes(modified_frames)
-            output_audio.close()
-            
-            return True
+            return AudioSteganography.embed_lsb(audio_path, PayloadContainer.pack(data, 'lsb', password), output_path)
         
         except Exception as e:
             print(f"[!] Error: {e}")
@@ -384,39 +825,15 @@ class AudioSteganography:
             password (str, optional): Password for decryption
             
         Returns:
-            str: Extracted data
+            str or bytes: Extracted data
         """
         try:
-            # Open the audio file
-            audio = wave.open(audio_path, 'rb')
-            
-            # Get audio parameters
-            nframes = audio.getnframes()
-            
-            # Read frames
-            frames = audio.readframes(nframes)
-            audio.close()
-            
-            # Convert frames to samples
-            samples = np.frombuffer(frames, dtype=np.int16)
-            
-            # Extract binary data from the audio
-            binary_data = ""
-            for i in range(min(len(samples), 100000)):  # Limit to prevent excessive processing
-                # Extract the least significant bit
-                binary_data += str(samples[i] & 1)
-            
-            # Convert binary data to ASCII
-            extracted_data = ""
-            for i in range(0, len(binary_data), 8):
-                if i + 8 <= len(binary_data):
-                    byte = binary_data[i:i+8]
-                    if byte == "00000000":  # Terminator
-                        break
-                    
-                    extracted_data += chr(int(byte, 2))
+            header, payload = AudioSteganography.read_lsb(audio_path)
+            if header:
+                return PayloadContainer.unpack(header, payload, 'lsb', password)
             
-            # Decrypt data if password is provided
+            # Older files hold Latin-1 text, base64 when encrypted
+            extracted_data = payload.decode('latin-1')
             if password:
                 extracted_data = Encryption.decrypt_aes(extracted_data, password)
             
@@ -433,7 +850,7 @@ class AudioSteganography:
         
         Args:
             audio_path (str): Path to the carrier audio file
-            data (str): Data to hide
+            data (str or bytes): Data to hide
             output_path (str): Path to save the output audio file
             password (str, optional): Password for encryption
             
@@ -443,17 +860,8 @@ class AudioSteganography:
         try:
             # This is a simplified implementation
             # In a real-world scenario, you would use echo hiding technique
-            # For now, we'll use a modified LSB approach
-            
-            # Encrypt data if password is provided
-            if password:
-                data = Encryption.encrypt_aes(data, password)
-            
-            # Add a marker to indicate echo method
-            data = "ECHO:" + data
-            
-            # Use LSB method for now
-            return AudioSteganography.hide_lsb(audio_path, data, output_path)
+            # For now, we'll use a modified LSB approach, with the method recorded in the container
+            return AudioSteganography.embed_lsb(audio_path, PayloadContainer.pack(data, 'echo', password), output_path)
         
         except Exception as e:
             print(f"[!] Error: {e}")
@@ -469,4 +877,430 @@ class AudioSteganography:
             password (str, optional): Password for decryption
             
         Returns:
-            <response clipped><NOTE>To save on context only part of this file has been shown to you. You should retry this tool after you have searched inside the file with `grep -n` in order to find the line numbers of what you are looking for.</NOTE>
\ No newline at end of file
+            str or bytes: Extracted data
+        """
+        try:
+            # Extract using LSB method for now
+            header, payload = AudioSteganography.read_lsb(audio_path)
+            if header:
+                return PayloadContainer.unpack(header, payload, 'echo', password)
+            
+            # Older files mark echo data with a text prefix
+            data = payload.decode('latin-1')
+            if data.startswith("ECHO:"):
+                data = data[5:]  # Remove marker
+                
+                # Decrypt data if password is provided
+                if password:
+                    data = Encryption.decrypt_aes(data, password)
+                
+                return data
+            
+            return None
+        
+        except Exception as e:
+            print(f"[!] Error: {e}")
+            return None
+
+class Encryption:
+    """Class for handling encryption operations"""
+    
+    @staticmethod
+    def encrypt_bytes(data, password):
+        """
+        Encrypt bytes with AES-256-CBC using a key derived from a password
+        
+        Args:
+            data (bytes): Data to encrypt
+            password (str): Password for encryption
+            
+        Returns:
+            bytes: IV followed by the ciphertext
+        """
+        key = hashlib.sha256(password.encode('utf-8')).digest()
+        iv = os.urandom(16)
+        
+        # Pad the data to the AES block size
+        padder = padding.PKCS7(algorithms.AES.block_size).padder()
+        padded_data = padder.update(data) + padder.finalize()
+        
+        cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
+        encryptor = cipher.encryptor()
+        return iv + encryptor.update(padded_data) + encryptor.finalize()
+    
+    @staticmethod
+    def decrypt_bytes(data, password):
+        """
+        Decrypt bytes produced by encrypt_bytes
+        
+        Args:
+            data (bytes): IV followed by the ciphertext
+            password (str): Password for decryption
+            
+        Returns:
+            bytes: Decrypted data
+        """
+        key = hashlib.sha256(password.encode('utf-8')).digest()
+        iv, ciphertext = data[:16], data[16:]
+        
+        cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
+        decryptor = cipher.decryptor()
+        padded_data = decryptor.update(ciphertext) + decryptor.finalize()
+        
+        # Remove the padding
+        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+        return unpadder.update(padded_data) + unpadder.finalize()
+    
+    @staticmethod
+    def encrypt_aes(data, password):
+        """
+        Encrypt text with AES-256-CBC using a key derived from a password
+        
+        Args:
+            data (str): Data to encrypt
+            password (str): Password for encryption
+            
+        Returns:
+            str: Base64-encoded IV and ciphertext
+        """
+        return base64.b64encode(Encryption.encrypt_bytes(data.encode('utf-8'), password)).decode('ascii')
+    
+    @staticmethod
+    def decrypt_aes(data, password):
+        """
+        Decrypt text produced by encrypt_aes
+        
+        Args:
+            data (str): Base64-encoded IV and ciphertext
+            password (str): Password for decryption
+            
+        Returns:
+            str: Decrypted data
+        """
+        return Encryption.decrypt_bytes(base64.b64decode(data), password).decode('utf-8')
+
+# Hide and extract functions for each carrier type and method
+METHODS = {
+    'image': {
+        'lsb': (ImageSteganography.hide_lsb, ImageSteganography.extract_lsb),
+        'dct': (ImageSteganography.hide_dct, ImageSteganography.extract_dct),
+        'metadata': (ImageSteganography.hide_metadata, ImageSteganography.extract_metadata)
+    },
+    'audio': {
+        'lsb': (AudioSteganography.hide_lsb, AudioSteganography.extract_lsb),
+        'echo': (AudioSteganography.hide_echo, AudioSteganography.extract_echo)
+    }
+}
+
+# Data and password shared by every job in a batch worker process
+BATCH_CONTEXT = {}
+
+class BatchProcessor:
+    """Class for running hide or extract jobs over many carriers in a process pool"""
+    
+    @staticmethod
+    def carriers(input_path, carrier_type):
+        """
+        List the carriers of a batch
+        
+        Args:
+            input_path (str): Directory to search recursively, or a manifest with one carrier per line,
+                              optionally followed by a tab and an output path
+            carrier_type (str): Carrier type, used to pick files in a directory
+            
+        Returns:
+            list: (carrier path, relative name, output path or None) tuples
+        """
+        if os.path.isdir(input_path):
+            extensions = AUDIO_EXTENSIONS if carrier_type == 'audio' else tuple(Image.registered_extensions())
+            carriers = []
+            for root, dirs, files in os.walk(input_path):
+                dirs.sort()
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in extensions:
+                        path = os.path.join(root, name)
+                        carriers.append((path, os.path.relpath(path, input_path), None))
+            return carriers
+        
+        entries = []
+        with open(input_path, 'r') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if not line.strip() or line.startswith('#'):
+                    continue
+                path, _, output = line.partition('\t')
+                entries.append((path.strip(), output.strip() or None))
+        
+        # Outputs without an explicit path keep the carriers' layout below their common directory
+        common = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path, _ in entries]) if entries else ''
+        return [(path, os.path.relpath(os.path.abspath(path), common), output) for path, output in entries]
+    
+    @staticmethod
+    def lossless_output(output_path):
+        """
+        Give an image output path a lossless format, appending .png to extensions such as .jpg
+        
+        Args:
+            output_path (str): Output path for a method that hides data in the pixels
+            
+        Returns:
+            str: Output path with a lossless image extension
+        """
+        # The original extension stays in the name, so photo.jpg and photo.png in one batch do not share an output
+        if Image.registered_extensions().get(os.path.splitext(output_path)[1].lower()) in LOSSLESS_IMAGE_FORMATS:
+            return output_path
+        return output_path + '.png'
+    
+    @staticmethod
+    def init_worker(data, password):
+        """
+        Store the data and password once per worker instead of sending them with every job
+        
+        Args:
+            data (str or bytes): Data to hide, None when extracting
+            password (str): Password for encryption or decryption
+        """
+        BATCH_CONTEXT['data'] = data
+        BATCH_CONTEXT['password'] = password
+    
+    @staticmethod
+    def run_job(job):
+        """
+        Run one hide or extract job
+        
+        Args:
+            job (tuple): (action, carrier type, method, carrier path, output path or None)
+            
+        Returns:
+            dict: Result record for the JSONL output
+        """
+        action, carrier_type, method, path, output = job
+        hide, extract = METHODS[carrier_type][method]
+        result = {'input': path, 'output': output, 'action': action, 'method': method}
+        start = time.time()
+        
+        # The methods report problems on stdout, so keep it to pick out the error message
+        messages = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(messages):
+                if output:
+                    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+                if action == 'hide':
+                    ok = hide(path, BATCH_CONTEXT['data'], output, BATCH_CONTEXT['password'])
+                    if ok:
+                        # Read the output back, checking the header and CRC, before counting the job as done
+                        data = BATCH_CONTEXT['data']
+                        expected = data if isinstance(data, bytes) else data.encode('utf-8')
+                        hidden = extract(output, BATCH_CONTEXT['password'])
+                        hidden = hidden.encode('utf-8') if isinstance(hidden, str) else hidden
+                        if hidden != expected:
+                            ok = False
+                            print(f"[!] Error: Payload did not survive in {output}")
+                else:
+                    data = extract(path, BATCH_CONTEXT['password'])
+                    ok = data is not None
+                    if ok:
+                        raw = data if isinstance(data, bytes) else data.encode('utf-8')
+                        result['bytes'] = len(raw)
+                        if output:
+                            with open(output, 'wb') as f:
+                                f.write(raw)
+                        elif isinstance(data, bytes):
+                            result['data_base64'] = base64.b64encode(data).decode('ascii')
+                        else:
+                            result['data'] = data
+            
+            result['status'] = 'ok' if ok else 'failed'
+            if not ok:
+                errors = [line[len("[!] Error: "):] for line in messages.getvalue().splitlines() if line.startswith("[!] Error: ")]
+                result['error'] = errors[-1] if errors else "No hidden data found"
+        
+        except Exception as e:
+            result['status'] = 'failed'
+            result['error'] = str(e)
+        
+        result['seconds'] = round(time.time() - start, 3)
+        return result
+    
+    @staticmethod
+    def failed_result(job, error):
+        """
+        Build the result record of a job that did not return one
+        
+        Args:
+            job (tuple): (action, carrier type, method, carrier path, output path or None)
+            error (str): Why the job failed
+            
+        Returns:
+            dict: Result record for the JSONL output
+        """
+        action, carrier_type, method, path, output = job
+        return {'input': path, 'output': output, 'action': action, 'method': method, 'status': 'failed', 'error': error}
+    
+    @staticmethod
+    def run(action, carrier_type, method, input_path, output_dir, results_path, data=None, password=None, workers=None):
+        """
+        Run a batch and stream one JSON result per carrier to a file
+        
+        Args:
+            action (str): hide or extract
+            carrier_type (str): Carrier type
+            method (str): Method name
+            input_path (str): Directory or manifest of carriers
+            output_dir (str): Directory for outputs that the manifest does not name
+            results_path (str): JSONL file to write results to
+            data (str or bytes, optional): Data to hide
+            password (str, optional): Password for encryption or decryption
+            workers (int, optional): Number of worker processes (default: CPU count)
+            
+        Returns:
+            tuple: (succeeded, failed) job counts
+        """
+        jobs = []
+        for path, name, output in BatchProcessor.carriers(input_path, carrier_type):
+            if not output and output_dir:
+                output = os.path.join(output_dir, name if action == 'hide' else name + '.out')
+            if action == 'hide' and output and carrier_type == 'image' and method != 'metadata':
+                output = BatchProcessor.lossless_output(output)
+            jobs.append((action, carrier_type, method, path, output))
+        
+        if action == 'hide' and any(job[4] is None for job in jobs):
+            print("[!] Error: Output directory is required for carriers without an output path in the manifest")
+            return 0, len(jobs)
+        
+        workers = workers or os.cpu_count()
+        print(f"[*] Running {len(jobs)} {action} jobs with {workers} workers")
+        succeeded = failed = 0
+        start = time.time()
+        
+        def new_pool():
+            return ProcessPoolExecutor(max_workers=workers, initializer=BatchProcessor.init_worker,
+                                       initargs=(data, password))
+        
+        queue = iter(jobs)
+        suspects = []
+        pending = {}
+        executor = new_pool()
+        try:
+            with open(results_path, 'w') as results:
+                while True:
+                    # Keep a bounded number of jobs queued; jobs caught in a crashed pool are rerun one at a
+                    # time, so only the one that crashes a worker again is recorded as failed
+                    while len(pending) < (1 if suspects else workers * BATCH_QUEUE_SIZE):
+                        job, retried = (suspects.pop(0), True) if suspects else (next(queue, None), False)
+                        if job is None:
+                            break
+                        pending[executor.submit(BatchProcessor.run_job, job)] = (job, retried, executor)
+                    if not pending:
+                        break
+                    
+                    # Results are written as soon as each one is ready, in completion order
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    crashed = False
+                    for future in done:
+                        job, retried, pool = pending.pop(future)
+                        try:
+                            result = future.result()
+                        except BrokenProcessPool:
+                            crashed = crashed or pool is executor
+                            if not retried:
+                                suspects.append(job)
+                                continue
+                            result = BatchProcessor.failed_result(job, "Worker process crashed")
+                        except Exception as e:
+                            result = BatchProcessor.failed_result(job, str(e))
+                        
+                        results.write(json.dumps(result) + "\n")
+                        results.flush()
+                        if result['status'] == 'ok':
+                            succeeded += 1
+                        else:
+                            failed += 1
+                            print(f"[!] {result['input']}: {result['error']}")
+                    
+                    # A crashed pool fails every job it still holds and accepts no more, so start a new one
+                    if crashed:
+                        executor.shutdown(wait=False)
+                        executor = new_pool()
+        finally:
+            executor.shutdown()
+        
+        elapsed = time.time() - start
+        print(f"[+] {succeeded} succeeded, {failed} failed in {elapsed:.1f}s ({len(jobs) / max(elapsed, 0.001):.1f} carriers/s)")
+        print(f"[+] Results saved to {results_path}")
+        return succeeded, failed
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Steganography Toolkit for hiding and extracting data")
+    parser.add_argument("action", choices=["hide", "extract"], help="Hide data in a carrier or extract it")
+    parser.add_argument("-t", "--type", choices=list(METHODS), default="image", help="Carrier type (default: image)")
+    parser.add_argument("-m", "--method", default="lsb", help="Method: lsb, dct or metadata for images; lsb or echo for audio (default: lsb)")
+    parser.add_argument("-i", "--input", required=True, help="Carrier file to hide data in, or stego file to extract from")
+    parser.add_argument("-o", "--output", help="Stego file to write when hiding, or file for the extracted data")
+    parser.add_argument("-d", "--data", help="Data to hide")
+    parser.add_argument("-f", "--file", help="Read the data to hide from a file")
+    parser.add_argument("-p", "--password", help="Password for AES encryption")
+    parser.add_argument("-b", "--batch", action="store_true", help="Treat -i as a directory or manifest of carriers and -o as an output directory")
+    parser.add_argument("-w", "--workers", type=int, help="Worker processes for batch mode (default: CPU count)")
+    parser.add_argument("-r", "--results", default="stego_results.jsonl", help="JSONL file for batch results (default: stego_results.jsonl)")
+    
+    args = parser.parse_args()
+    
+    print(BANNER)
+    
+    if args.method not in METHODS[args.type]:
+        print(f"[!] Error: Method {args.method} is not available for {args.type} files")
+        sys.exit(1)
+    hide, extract = METHODS[args.type][args.method]
+    
+    if args.action == "hide":
+        if not args.output and not args.batch:
+            print("[!] Error: Output file is required for hiding data")
+            sys.exit(1)
+        if args.file:
+            # Files are hidden byte for byte, whatever they contain
+            with open(args.file, 'rb') as f:
+                data = f.read()
+        elif args.data is not None:
+            data = args.data
+        else:
+            print("[!] Error: Provide data with -d or -f")
+            sys.exit(1)
+        
+        if args.batch:
+            BatchProcessor.run("hide", args.type, args.method, args.input, args.output, args.results,
+                               data, args.password, args.workers)
+            return
+            
+        print(f"[*] Hiding {len(data)} {'bytes' if isinstance(data, bytes) else 'characters'} in {args.input} using {args.method}")
+        if hide(args.input, data, args.output, args.password):
+            print(f"[+] Data hidden successfully in {args.output}")
+        else:
+            print("[!] Failed to hide data")
+            sys.exit(1)
+    elif args.batch:
+        BatchProcessor.run("extract", args.type, args.method, args.input, args.output, args.results,
+                           password=args.password, workers=args.workers)
+    else:
+        print(f"[*] Extracting data from {args.input} using {args.method}")
+        data = extract(args.input, args.password)
+        if data is None:
+            print("[!] No hidden data found")
+            sys.exit(1)
+        if args.output:
+            with open(args.output, 'wb') as f:
+                f.write(data if isinstance(data, bytes) else data.encode('utf-8'))
+            print(f"[+] Extracted data saved to {args.output}")
+        elif isinstance(data, bytes):
+            print(f"[+] Extracted {len(data)} bytes of binary data; use -o to save them")
+        else:
+            print("[+] Extracted data:")
+            print(data)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n[!] Operation interrupted by user. Exiting...")
+        sys.exit(0)
